@@ -4,7 +4,7 @@ Create Flask app and register the blueprint app_views to the Flask instance app.
 '''
 
 from os import getenv
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 from models import storage
 from api.v1.views import app_views
@@ -18,6 +18,16 @@ app.register_blueprint(app_views)
 app.url_map.strict_slashes = False
 
 
+@app.before_request
+def route_writes():
+    '''
+    Sends the queries of requests that may write to the primary database,
+    so that they do not read stale rows from a replica.
+    '''
+    if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+        storage.use_primary()
+
+
 @app.teardown_appcontext
 def teardown_engine(exception):
     '''
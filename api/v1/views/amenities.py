@@ -7,18 +7,23 @@ Creates a view for Amenity objects - handles all default RESTful API actions.
 from flask import abort, jsonify, request
 from models.amenity import Amenity
 from api.v1.views import app_views
+from api.v1.views.listing import jsonify_list
+from api.v1.views.pagination import paginate, paginating
 from models import storage
 
 
 @app_views.route('/amenities', methods=['GET'], strict_slashes=False)
 def get_all_amenities():
     '''
-    Retrieves the list of all Amenity objects.
+    Retrieves the list of all Amenity objects, or a page of them when the
+    `limit` or `cursor` query parameter is given.
     '''
+    if paginating():
+        return paginate(Amenity)
     # Get all Amenity objects from the storage
     amenities = storage.all(Amenity).values()
     # Convert objects to dictionaries and jsonify the list
-    return jsonify([amenity.to_dict() for amenity in amenities])
+    return jsonify_list(amenities)
 
 
 @app_views.route('/amenities/<amenity_id>', methods=['GET'], strict_slashes=False)
@@ -97,8 +102,10 @@ def update_amenity(amenity_id):
             if key not in ignore_keys:
                 setattr(amenity, key, value)
 
-        # Save the updated Amenity object to the storage
-        amenity.save()
+        # Save the updated Amenity object to the storage, unless no value
+        # changed, which keeps its updated_at
+        if amenity.changed():
+            amenity.save()
         # Return the updated Amenity object in JSON format with 200 status code
         return jsonify(amenity.to_dict()), 200
     else:
@@ -9,6 +9,7 @@ from flask import abort, jsonify, request
 from models.state import State
 from models.city import City
 from api.v1.views import app_views
+from api.v1.views.listing import jsonify_list
 from models import storage
 
 
@@ -26,8 +27,7 @@ def get_cities_by_state(state_id):
 
     # Get all City objects associated with
     #   the State and convert them to dictionaries
-    cities = [city.to_dict() for city in state.cities]
-    return jsonify(cities)
+    return jsonify_list(state.cities)
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'], strict_slashes=False)
@@ -117,8 +117,10 @@ def update_city(city_id):
             if key not in ignore_keys:
                 setattr(city, key, value)
 
-        # Save the updated City object to the storage
-        city.save()
+        # Save the updated City object to the storage, unless no value
+        # changed, which keeps its updated_at
+        if city.changed():
+            city.save()
         # Return the updated City object in JSON format with 200 status code
         return jsonify(city.to_dict()), 200
     else:
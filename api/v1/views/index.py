@@ -3,7 +3,7 @@
 Create a route `/status` on the object app_views.
 '''
 
-from flask import jsonify
+from flask import abort, jsonify
 from api.v1.views import app_views
 from models import storage
 
@@ -22,12 +22,24 @@ def get_stats():
     '''
     Retrieves the number of each object type.
     '''
+    counts = storage.count_all()
     stats = {
-        'amenities': storage.count('Amenity'),
-        'cities': storage.count('City'),
-        'places': storage.count('Place'),
-        'reviews': storage.count('Review'),
-        'states': storage.count('State'),
-        'users': storage.count('User')
+        'amenities': counts['Amenity'],
+        'cities': counts['City'],
+        'places': counts['Place'],
+        'reviews': counts['Review'],
+        'states': counts['State'],
+        'users': counts['User']
     }
     return jsonify(stats)
+
+
+@app_views.route('/stats/pool', methods=['GET'])
+def get_pool_stats():
+    '''
+    Retrieves the connection pool occupancy and checkout wait times.
+    '''
+    stats = storage.pool_stats()
+    if stats is None:
+        abort(404)
+    return jsonify(stats)
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+'''
+Helper writing the JSON lists of objects of the list endpoints.
+'''
+
+from json import dumps
+from flask import current_app, jsonify
+from flask.json.provider import DefaultJSONProvider
+from models.serializer import COMPACT
+
+
+def compact_json():
+    '''
+    Returns whether jsonify() writes the compact JSON text of to_json(),
+    sorted, without spaces and ASCII only.
+    '''
+    provider = current_app.json
+    if not isinstance(provider, DefaultJSONProvider):
+        return False
+    if provider.compact is False or \
+            provider.compact is None and current_app.debug:
+        return False
+    return provider.sort_keys and provider.ensure_ascii
+
+
+def jsonify_list(objs, exclude=()):
+    '''
+    Returns the JSON response of the list of the to_dict() of objs without
+    the exclude keys, the same as jsonify() of that list.
+
+    The list is spliced from the compact to_json() text of each object,
+    which an unchanged object keeps between requests when HBNB_JSON_CACHE
+    is set, rather than serialized again as a whole.
+    '''
+    objs = list(objs)
+    if compact_json():
+        try:
+            fragments = []
+            for obj in objs:
+                if any(key in obj.__dict__ for key in exclude):
+                    d = obj.to_dict()
+                    for key in exclude:
+                        d.pop(key, None)
+                    fragments.append(dumps(d, **COMPACT))
+                else:
+                    fragments.append(obj.to_json(compact=True))
+        except TypeError:
+            # a value json.dumps() can't encode, but jsonify() may
+            pass
+        else:
+            return current_app.response_class(
+                '[' + ','.join(fragments) + ']\n',
+                mimetype=current_app.json.mimetype)
+    dicts = []
+    for obj in objs:
+        d = obj.to_dict()
+        for key in exclude:
+            d.pop(key, None)
+        dicts.append(d)
+    return jsonify(dicts)
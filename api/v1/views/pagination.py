@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+'''
+Helpers for the `limit`/`cursor` keyset pagination of list endpoints.
+'''
+
+from flask import abort, request
+from api.v1.views.listing import jsonify_list
+from models import storage
+
+# number of objects of a page when only a cursor is given
+DEFAULT_LIMIT = 100
+# largest page a client can ask for
+MAX_LIMIT = 1000
+
+
+def paginating():
+    '''
+    Returns whether the request asks for a page rather than the full list.
+    '''
+    return 'limit' in request.args or 'cursor' in request.args
+
+
+def page_args():
+    '''
+    Returns the limit and cursor of the request, aborting with 400 on an
+    invalid limit.
+    '''
+    try:
+        limit = int(request.args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        abort(400, 'Invalid limit')
+    if limit < 1:
+        abort(400, 'Invalid limit')
+    return min(limit, MAX_LIMIT), request.args.get('cursor') or None
+
+
+def page_response(objs, limit, exclude=()):
+    '''
+    Returns the JSON list of the first limit objects of objs, without the
+    exclude keys. One more object than limit means there is a next page,
+    whose cursor is then sent in the X-Next-Cursor header.
+    '''
+    response = jsonify_list(objs[:limit], exclude)
+    if len(objs) > limit:
+        response.headers['X-Next-Cursor'] = objs[limit - 1].id
+    return response
+
+
+def paginate(cls, filters=None):
+    '''
+    Returns the JSON response of the page of objects of cls asked for by
+    the request.
+    '''
+    limit, cursor = page_args()
+    return page_response(storage.page(cls, cursor, limit + 1, filters),
+                         limit)
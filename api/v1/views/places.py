@@ -12,6 +12,9 @@ from models.state import State
 from models.user import User
 from models.amenity import Amenity
 from api.v1.views import app_views
+from api.v1.views.listing import jsonify_list
+from api.v1.views.pagination import page_args, page_response, paginate
+from api.v1.views.pagination import paginating
 from models import storage
 
 
@@ -19,17 +22,22 @@ from models import storage
                  strict_slashes=False)
 def get_places_by_city(city_id):
     '''
-    Retrieves the list of all Place objects of a City
+    Retrieves the list of all Place objects of a City, or a page of them
+    when the `limit` or `cursor` query parameter is given
     '''
-    # Get the City object with the given ID from the storage
-    city = storage.get(City, city_id)
+    if paginating():
+        if not storage.get(City, city_id):
+            abort(404)
+        return paginate(Place, {'city_id': city_id})
+
+    # Get the City object with the given ID and its places from the storage
+    city = storage.get(City, city_id, load=['places'])
     if not city:
         # Return 404 error if the City object is not found
         abort(404)
 
     # Get all Place objects of the City and convert them to dictionaries
-    places = [place.to_dict() for place in city.places]
-    return jsonify(places)
+    return jsonify_list(city.places)
 
 
 @app_views.route('/places/<place_id>', methods=['GET'],
@@ -129,8 +137,10 @@ def update_place(place_id):
             if key not in ignore_keys:
                 setattr(place, key, value)
 
-        # Save the updated Place object to the storage
-        place.save()
+        # Save the updated Place object to the storage, unless no value
+        # changed, which keeps its updated_at
+        if place.changed():
+            place.save()
         # Return the updated Place object in JSON format with 200 status code
         return jsonify(place.to_dict()), 200
     else:
@@ -178,22 +188,26 @@ def places_search():
         cities = data.get('cities', None)
         amenities = data.get('amenities', None)
 
+    if paginating():
+        if not data or not len(data):
+            states = cities = amenities = None
+        return search_page(states, cities, amenities)
+
     # If no criteria provided, retrieve all places
     if not data or not len(data) or (
             not states and
             not cities and
             not amenities):
         places = storage.all(Place).values()
-        list_places = []
-        for place in places:
-            list_places.append(place.to_dict())
-        return jsonify(list_places)
+        return jsonify_list(places)
 
     list_places = []
 
     # Filter and retrieve places based on states criteria
     if states:
-        states_obj = [storage.get(State, s_id) for s_id in states]
+        states_obj = storage.get_many(State, states)
+        # Load the cities and places of all the states in batched queries
+        storage.prefetch([s for s in states_obj if s], 'cities.places')
         for state in states_obj:
             if state:
                 for city in state.cities:
@@ -203,7 +217,8 @@ def places_search():
 
     # Filter and retrieve places based on cities criteria
     if cities:
-        city_obj = [storage.get(City, c_id) for c_id in cities]
+        city_obj = storage.get_many(City, cities)
+        storage.prefetch([c for c in city_obj if c], 'places')
         for city in city_obj:
             if city:
                 for place in city.places:
@@ -213,19 +228,47 @@ def places_search():
     # Filter places based on amenities criteria
     if amenities:
         if not list_places:
-            list_places = storage.all(Place).values()
-        amenities_obj = [storage.get(Amenity, a_id) for a_id in amenities]
+            list_places = storage.all(Place, load=['amenities']).values()
+        else:
+            storage.prefetch(list_places, 'amenities')
+        amenities_obj = storage.get_many(Amenity, amenities)
 
         list_places = [place for place in list_places
                        if all([am in place.amenities
                                for am in amenities_obj])]
 
-    # Prepare the final list of places for response
-    places = []
-    for p in list_places:
-        d = p.to_dict()
-        d.pop('amenities', None)
-        places.append(d)
+    # Return the list of places in JSON format, without their amenities
+    return jsonify_list(list_places, exclude=('amenities',))
 
-    # Return the list of places in JSON format
-    return jsonify(places)
+
+def search_page(states, cities, amenities):
+    '''
+    Returns a page of the places_search results in id order: the places
+    of the states and cities, or all places when there are none and
+    amenities are given, that have all the amenities
+    '''
+    limit, cursor = page_args()
+    filters = None
+    if states or cities:
+        states_obj = storage.get_many(State, states or [])
+        states_obj = [state for state in states_obj if state]
+        storage.prefetch(states_obj, 'cities')
+        city_ids = [city.id for state in states_obj for city in state.cities]
+        city_ids += cities or []
+        filters = {'city_id': city_ids}
+        if amenities and not storage.page(Place, None, 1, filters):
+            filters = None
+    amenities_obj = storage.get_many(Amenity, amenities or [])
+
+    # Read pages of places until enough of them have all the amenities
+    results = []
+    while True:
+        batch = storage.page(Place, cursor, limit + 1, filters)
+        if amenities_obj:
+            storage.prefetch(batch, 'amenities')
+        results += [place for place in batch
+                    if all([am in place.amenities for am in amenities_obj])]
+        if len(results) > limit or len(batch) <= limit:
+            break
+        cursor = batch[-1].id
+    return page_response(results, limit, exclude=('amenities',))
@@ -3,9 +3,9 @@
 
 from models.place import Place
 from models.amenity import Amenity
-from models import storage
+from models import storage, storage_t
 from api.v1.views import app_views
-from os import environ
+from api.v1.views.listing import jsonify_list
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -23,13 +23,13 @@ def get_place_amenities(place_id):
     if not place:
         abort(404)
 
-    if environ.get('HBNB_TYPE_STORAGE') == "db":
-        amenities = [amenity.to_dict() for amenity in place.amenities]
+    if storage_t == "db":
+        amenities = place.amenities
     else:
-        amenities = [storage.get(Amenity, amenity_id).to_dict()
+        amenities = [storage.get(Amenity, amenity_id)
                      for amenity_id in place.amenity_ids]
 
-    return jsonify(amenities)
+    return jsonify_list(amenities)
 
 
 @app_views.route('/places/<place_id>/amenities/<amenity_id>',
@@ -50,14 +50,16 @@ def delete_place_amenity(place_id, amenity_id):
     if not amenity:
         abort(404)
 
-    if environ.get('HBNB_TYPE_STORAGE') == "db":
+    if storage_t == "db":
         if amenity not in place.amenities:
             abort(404)
         place.amenities.remove(amenity)
     else:
         if amenity_id not in place.amenity_ids:
             abort(404)
-        place.amenity_ids.remove(amenity_id)
+        place.amenity_ids = [a_id for a_id in place.amenity_ids
+                             if a_id != amenity_id]
+        storage.new(place)
 
     storage.save()
     return make_response(jsonify({}), 200)
@@ -81,7 +83,7 @@ def post_place_amenity(place_id, amenity_id):
     if not amenity:
         abort(404)
 
-    if environ.get('HBNB_TYPE_STORAGE') == "db":
+    if storage_t == "db":
         if amenity in place.amenities:
             return make_response(jsonify(amenity.to_dict()), 200)
         else:
@@ -90,7 +92,8 @@ def post_place_amenity(place_id, amenity_id):
         if amenity_id in place.amenity_ids:
             return make_response(jsonify(amenity.to_dict()), 200)
         else:
-            place.amenity_ids.append(amenity_id)
+            place.amenity_ids = place.amenity_ids + [amenity_id]
+            storage.new(place)
 
     storage.save()
     return make_response(jsonify(amenity.to_dict()), 201)
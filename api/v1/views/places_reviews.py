@@ -9,6 +9,7 @@ from models.place import Place
 from models.review import Review
 from models.user import User
 from api.v1.views import app_views
+from api.v1.views.listing import jsonify_list
 from models import storage
 
 
@@ -19,15 +20,14 @@ def get_reviews_by_place(place_id):
     '''
     Retrieves the list of all Review objects of a Place
     '''
-    # Get the Place object with the given ID from the storage
-    place = storage.get(Place, place_id)
+    # Get the Place object with the given ID and its reviews from the storage
+    place = storage.get(Place, place_id, load=['reviews'])
     if not place:
         # Return 404 error if the Place object is not found
         abort(404)
 
     # Get all Review objects of the Place and convert them to dictionaries
-    reviews = [review.to_dict() for review in place.reviews]
-    return jsonify(reviews)
+    return jsonify_list(place.reviews)
 
 
 # Route for retrieving a specific Review object by ID
@@ -131,8 +131,10 @@ def update_review(review_id):
             if key not in ignore_keys:
                 setattr(review, key, value)
 
-        # Save the updated Review object to the storage
-        review.save()
+        # Save the updated Review object to the storage, unless no value
+        # changed, which keeps its updated_at
+        if review.changed():
+            review.save()
         # Return the updated Review object in JSON format with 200 status code
         return jsonify(review.to_dict()), 200
     else:
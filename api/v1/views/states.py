@@ -7,19 +7,23 @@ Create a new view for State objects - handles all default RESTful API actions.
 from flask import abort, jsonify, request
 from models.state import State
 from api.v1.views import app_views
+from api.v1.views.listing import jsonify_list
+from api.v1.views.pagination import paginate, paginating
 from models import storage
 
 # Route for retrieving all State objects
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
 def get_all_states():
     """
-    Retrieves the list of all State objects.
+    Retrieves the list of all State objects, or a page of them when the
+    `limit` or `cursor` query parameter is given.
     """
+    if paginating():
+        return paginate(State)
     # Get all State objects from the storage
     states = storage.all(State).values()
     # Convert objects to dictionaries and jsonify the list
-    state_list = [state.to_dict() for state in states]
-    return jsonify(state_list)
+    return jsonify_list(states)
 
 # Route for retrieving a specific State object by ID
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
@@ -98,8 +102,10 @@ def update_state(state_id):
             if key not in ignore_keys:
                 setattr(state, key, value)
 
-        # Save the updated State object to the storage
-        state.save()
+        # Save the updated State object to the storage, unless no value
+        # changed, which keeps its updated_at
+        if state.changed():
+            state.save()
         # Return the updated State object in JSON format with 200 status code
         return jsonify(state.to_dict()), 200
     else:
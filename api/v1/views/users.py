@@ -8,6 +8,8 @@ from flask import abort, jsonify, request
 # Import the User model
 from models.user import User
 from api.v1.views import app_views
+from api.v1.views.listing import jsonify_list
+from api.v1.views.pagination import paginate, paginating
 from models import storage
 
 
@@ -15,11 +17,14 @@ from models import storage
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
 def get_all_users():
     '''
-    Retrieves the list of all User objects
+    Retrieves the list of all User objects, or a page of them when the
+    `limit` or `cursor` query parameter is given
     '''
+    if paginating():
+        return paginate(User)
     # Get all User objects from the storage and convert them to dictionaries
     users = storage.all(User).values()
-    return jsonify([user.to_dict() for user in users])
+    return jsonify_list(users)
 
 
 # Route for retrieving a specific User object by ID
@@ -70,12 +75,18 @@ def create_user():
 
     # Get the JSON data from the request
     data = request.get_json()
+    # A __class__ key would make the data a stored record, whose password
+    # is not hashed
+    data.pop('__class__', None)
     if 'email' not in data:
         # Return 400 error if 'email' key is missing in the JSON data
         abort(400, 'Missing email')
     if 'password' not in data:
         # Return 400 error if 'password' key is missing in the JSON data
         abort(400, 'Missing password')
+    if not isinstance(data['password'], str):
+        # Return 400 error if the password can't be hashed
+        abort(400, 'Password must be a string')
 
     # Create a new User object with the JSON data
     user = User(**data)
@@ -101,14 +112,22 @@ def update_user(user_id):
 
         # Get the JSON data from the request
         data = request.get_json()
+        if 'password' in data and not isinstance(data['password'], str):
+            # Return 400 error if the password can't be hashed
+            abort(400, 'Password must be a string')
         ignore_keys = ['id', 'email', 'created_at', 'updated_at']
         # Update the attributes of the User object with the JSON data
         for key, value in data.items():
-            if key not in ignore_keys:
+            if key == 'password':
+                # Hash the new password rather than storing it in plaintext
+                user.update_password(value)
+            elif key not in ignore_keys:
                 setattr(user, key, value)
 
-        # Save the updated User object to the storage
-        user.save()
+        # Save the updated User object to the storage, unless no value
+        # changed, which keeps its updated_at
+        if user.changed():
+            user.save()
         # Return the updated User object in JSON format with 200 status code
         return jsonify(user.to_dict()), 200
     else:
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""
+Compares the time to build the objects of a JSON snapshot sequentially
+and on pools of processes, as with HBNB_FILE_WORKERS set.
+
+The objects are pickled back from the workers, which only pays off with
+CPUs to spare. Measured on CPython 3.11 on a single CPU, where
+FileStorage now loads sequentially whatever HBNB_FILE_WORKERS says, with
+100000 objects:
+
+    workers  load s
+    1         3.526
+    2         6.293
+    4         6.700
+    8         6.071
+
+No multi-core timings have been recorded yet.
+
+Usage: python3 -m benchmarks.parallel_load [number of objects] [workers...]
+"""
+
+from benchmarks.storage_format import population
+from models.engine import parallel
+from models.engine.file_storage import classes
+from models.engine.serializers import JSONSerializer
+import os
+import sys
+import tempfile
+import time
+
+
+def sequential(path):
+    """Returns the objects of the snapshot built in this process"""
+    with open(path, 'rb') as f:
+        return [classes[value["__class__"]](**value)
+                for key, value in JSONSerializer().read(f)]
+
+
+def measure(load, *args):
+    """Returns the best time of three loads and the number of objects"""
+    best = None
+    for i in range(3):
+        start = time.perf_counter()
+        objs = load(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(objs)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    counts = [int(arg) for arg in sys.argv[2:]] or [2, 4, 8]
+    objs = population(n)
+    print("{} objects, {} CPUs".format(len(objs), os.cpu_count()))
+    print("{:<8} {:>10}".format("workers", "load s"))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.json")
+        JSONSerializer().write(path, ((type(obj).__name__ + "." + obj.id,
+                                       obj.to_dict()) for obj in objs))
+        del objs
+        elapsed, count = measure(sequential, path)
+        print("{:<8} {:>10.3f}".format(1, elapsed))
+        for workers in counts:
+            elapsed, loaded = measure(parallel.load, path, workers, classes)
+            assert loaded == count
+            print("{:<8} {:>10.3f}".format(workers, elapsed))
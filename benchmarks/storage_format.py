@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Compares the file size, save time and load time of the FileStorage
+snapshot formats.
+
+The load time includes building the objects, which the binary format
+speeds up by reading timestamps back as datetime objects. Its writer is
+pure Python and interns every short string, so it saves no faster than
+JSON, and slower for large snapshots. Measured on one core:
+
+    objects  format       bytes     save s     load s
+     20000   json       7346120  0.28-0.35  0.67-0.83
+     20000   binary     1598473  0.29-0.37  0.51-0.65
+    100000   json      36754960  1.16-1.54  3.89-3.96
+    100000   binary     8240709  1.66-1.86  3.25-3.49
+
+Usage: python3 -m benchmarks.storage_format [number of objects]
+"""
+
+from models.city import City
+from models.engine.file_storage import classes
+from models.engine.serializers import serializers
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import os
+import sys
+import tempfile
+import time
+
+
+def population(n):
+    """Returns about n objects linked like a real data set"""
+    states = [State(name="State {}".format(i)) for i in range(max(n // 1000,
+                                                                  1))]
+    users = [User(email="user{}@example.com".format(i), password="pwd",
+                  first_name="First", last_name="Last")
+             for i in range(max(n // 10, 1))]
+    cities = [City(name="City {}".format(i),
+                   state_id=states[i % len(states)].id)
+              for i in range(max(n // 100, 1))]
+    places = [Place(name="Place {}".format(i),
+                    city_id=cities[i % len(cities)].id,
+                    user_id=users[i % len(users)].id,
+                    description="A nice place", number_rooms=3,
+                    number_bathrooms=1, max_guest=6, price_by_night=120,
+                    latitude=37.77, longitude=-122.43)
+              for i in range(max(n // 4, 1))]
+    objs = states + users + cities + places
+    objs += [Review(text="Great stay", place_id=places[i % len(places)].id,
+                    user_id=users[i % len(users)].id)
+             for i in range(max(n - len(objs), 0))]
+    return objs
+
+
+def measure(serializer, objs, path):
+    """Returns the size, save time and load time of a snapshot of objs"""
+    start = time.perf_counter()
+    serializer.write(path, ((type(obj).__name__ + "." + obj.id,
+                             obj.to_dict()) for obj in objs))
+    saved = time.perf_counter() - start
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        loaded = [classes[value["__class__"]](**value)
+                  for key, value in serializer.read(f)]
+    load = time.perf_counter() - start
+    assert len(loaded) == len(objs)
+    return os.path.getsize(path), saved, load
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    objs = population(n)
+    print("{} objects".format(len(objs)))
+    print("{:<8} {:>12} {:>10} {:>10}".format("format", "bytes", "save s",
+                                              "load s"))
+    with tempfile.TemporaryDirectory() as directory:
+        for name, serializer in serializers.items():
+            size, save, load = measure(serializer(), objs,
+                                       os.path.join(directory, name))
+            print("{:<8} {:>12} {:>10.3f} {:>10.3f}".format(name, size, save,
+                                                            load))
@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+"""
+Compares the timestamp codec of to_dict() with strptime() and strftime(),
+encoding distinct datetimes and datetimes repeated as objects are
+serialized again and again.
+
+Usage: python3 -m benchmarks.timestamps [number of timestamps]
+"""
+
+from datetime import datetime, timedelta
+from models import timestamps
+from models.timestamps import TIME_FORMAT
+import sys
+import timeit
+
+
+def best(function, items):
+    """Returns the best time of calling function on each item"""
+    return min(timeit.repeat(lambda: [function(item) for item in items],
+                             number=1, repeat=5))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    start = datetime(2024, 1, 1)
+    values = [start + timedelta(seconds=i, microseconds=i * 7)
+              for i in range(n)]
+    strings = [value.strftime(TIME_FORMAT) for value in values]
+    repeated = values[:max(n // 20, 1)] * 20
+    rows = [("decode", best(lambda s: datetime.strptime(s, TIME_FORMAT),
+                            strings), best(timestamps.decode, strings)),
+            ("encode", best(lambda value: value.strftime(TIME_FORMAT),
+                            values), best(timestamps.encode, values)),
+            ("repeated", best(lambda value: value.strftime(TIME_FORMAT),
+                              repeated), best(timestamps.encode, repeated))]
+    print("{} timestamps".format(n))
+    print("{:<10} {:>10} {:>10} {:>8}".format("operation", "stdlib s",
+                                              "codec s", "speedup"))
+    for name, baseline, codec in rows:
+        print("{:<10} {:>10.4f} {:>10.4f} {:>7.1f}x".format(
+            name, baseline, codec, baseline / codec))
@@ -8,7 +8,12 @@ from os import getenv
 
 storage_t = getenv("HBNB_TYPE_STORAGE")
 
-if storage_t == "db":
+if storage_t == "sqlite":
+    # SQLite stores the same mapped models as MySQL
+    storage_t = "db"
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
 else:
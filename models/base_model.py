@@ -5,13 +5,21 @@ Contains class BaseModel
 
 from datetime import datetime
 import models
+from models import timestamps
+from models.serializer import get_serializer
 from os import getenv
 import sqlalchemy
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 
-time = "%Y-%m-%dT%H:%M:%S.%f"
+time = timestamps.TIME_FORMAT
+# bool - whether instances keep their JSON text until they change, which
+# needs every change to go through attribute assignment, so not with the
+# database storage whose loads fill __dict__ directly
+cache_json = models.storage_t != "db" and getenv("HBNB_JSON_CACHE") == "1"
+# object - marks an attribute the instance did not have
+missing = object()
 
 if models.storage_t == "db":
     Base = declarative_base()
@@ -21,6 +29,10 @@ else:
 
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
+    # the JSON cache and the names of the changed attributes are slots, so
+    # they stay out of __dict__ and to_dict()
+    __slots__ = ("__dict__", "__weakref__", "__json", "__changes")
+
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
@@ -33,12 +45,12 @@ class BaseModel:
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
-            else:
+                self.created_at = timestamps.decode(kwargs["created_at"])
+            elif type(kwargs.get("created_at", None)) is not datetime:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
-            else:
+                self.updated_at = timestamps.decode(kwargs["updated_at"])
+            elif type(kwargs.get("updated_at", None)) is not datetime:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
                 self.id = str(uuid.uuid4())
@@ -47,6 +59,36 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute, keeping the storage foreign key indexes
+            current, dropping the cached JSON text and recording the name
+            of the attribute when its value changes"""
+            current = self.__dict__.get(name, missing)
+            if name.endswith("_id"):
+                old = getattr(self, name, None)
+                super().__setattr__(name, value)
+                models.storage.reindex(self, name, old)
+            else:
+                super().__setattr__(name, value)
+            object.__setattr__(self, "_BaseModel__json", None)
+            if type(current) is not type(value) or current != value:
+                self.__change(name)
+
+        def __delattr__(self, name):
+            """deletes an attribute, dropping the cached JSON text"""
+            super().__delattr__(name)
+            object.__setattr__(self, "_BaseModel__json", None)
+            self.__change(name)
+
+        def __change(self, name):
+            """records that the attribute name changed"""
+            changes = getattr(self, "_BaseModel__changes", None)
+            if changes is None:
+                object.__setattr__(self, "_BaseModel__changes", {name})
+            else:
+                changes.add(name)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
@@ -58,17 +100,42 @@ class BaseModel:
         models.storage.new(self)
         models.storage.save()
 
-    def to_dict(self):
-        """returns a dictionary containing all keys/values of the instance"""
-        new_dict = self.__dict__.copy()
-        if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
-        if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
-        new_dict["__class__"] = self.__class__.__name__
-        if "_sa_instance_state" in new_dict:
-            del new_dict["_sa_instance_state"]
-        return new_dict
+    def changed(self):
+        """returns the set of the names of the attributes changed since the
+        instance was loaded or last saved"""
+        if models.storage_t == "db":
+            state = sqlalchemy.inspect(self, raiseerr=False)
+            if state is None:
+                return set()
+            return {attr.key for attr in state.attrs
+                    if attr.history.has_changes()}
+        return set(getattr(self, "_BaseModel__changes", None) or ())
+
+    def clear_changes(self):
+        """forgets the changes recorded, called by the file storage once
+        the instance matches its stored record"""
+        object.__setattr__(self, "_BaseModel__changes", None)
+
+    def to_dict(self, fields=None):
+        """returns a dictionary containing all keys/values of the instance,
+        or only the keys in fields"""
+        return get_serializer(self.__class__).to_dict(self, fields)
+
+    def to_json(self, fields=None, compact=False):
+        """returns the JSON text of to_dict(), as json.dumps() writes it,
+        or sorted and without spaces as jsonify() does when compact"""
+        serializer = get_serializer(self.__class__)
+        if fields is not None or not cache_json:
+            return serializer.to_json(self, fields, compact)
+        # a new list on each change, so a text encoded while the instance
+        # changes is never stored in the cache of the new values
+        cache = getattr(self, "_BaseModel__json", None)
+        if cache is None:
+            cache = [None, None]
+            object.__setattr__(self, "_BaseModel__json", cache)
+        if cache[compact] is None:
+            cache[compact] = serializer.to_json(self, None, compact)
+        return cache[compact]
 
     def delete(self):
         """delete the current instance from the storage"""
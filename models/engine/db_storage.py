@@ -7,19 +7,29 @@ import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.group_commit import GroupCommit
+from models.engine.pool import TimedQueuePool
+from models.engine.replicas import Replicas, RoutingSession
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
-import hashlib  # Added hashlib for password hashing
+from sqlalchemy import create_engine, func, literal, select, union_all
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import make_transient, make_transient_to_detached
+from sqlalchemy.orm import scoped_session, selectinload, sessionmaker
+import threading
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# number of objects whose relationships prefetch() loads per query
+PREFETCH_BATCH = 500
+# number of rows bulk_upsert() sends per executemany
+UPSERT_BATCH = 1000
+
 
 class DBStorage:
     """
@@ -27,33 +37,99 @@ class DBStorage:
 
     This class provides methods to interact with a MySQL database
     to store and retrieve objects from the database.
+
+    With HBNB_MYSQL_REPLICAS set to a comma-separated list of database
+    URLs, each session reads from one of these replicas, picked round-robin
+    among the healthy ones, until it writes or use_primary() is called.
+    From then on it reads from the primary until it is closed. A replica
+    whose connection fails is skipped for HBNB_MYSQL_REPLICA_RETRY seconds
+    (default 30), then checked again.
     """
 
     __engine = None
     __session = None
+    __writer = None
 
     def __init__(self):
         """Instantiate a DBStorage object"""
+        HBNB_ENV = getenv('HBNB_ENV')
+        self.__engine = self.engine()
+        if HBNB_ENV == "test":
+            Base.metadata.drop_all(self.__engine)
+        self.__replicas = None
+        if getenv('HBNB_MYSQL_REPLICAS'):
+            self.__replicas = Replicas(
+                [create_engine(url.strip(), **self.pool_options())
+                 for url in getenv('HBNB_MYSQL_REPLICAS').split(',')],
+                float(getenv('HBNB_MYSQL_REPLICA_RETRY', 30)))
+        self.__group = None
+        if getenv('HBNB_COMMIT_WINDOW_MS'):
+            self.__group = GroupCommit(
+                self.__flush, float(getenv('HBNB_COMMIT_WINDOW_MS')) / 1000,
+                int(getenv('HBNB_COMMIT_BATCH', 64)))
+            self.__writer_lock = threading.Lock()
+
+    def engine(self):
+        """Returns the engine of the primary database"""
         HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
         HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
-        HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
-        if HBNB_ENV == "test":
-            Base.metadata.drop_all(self.__engine)
+        return create_engine('mysql+mysqldb://{}:{}@{}/{}'.
+                             format(HBNB_MYSQL_USER,
+                                    HBNB_MYSQL_PWD,
+                                    HBNB_MYSQL_HOST,
+                                    HBNB_MYSQL_DB),
+                             **self.pool_options())
+
+    @staticmethod
+    def pool_options():
+        """
+        Returns the connection pool arguments of create_engine() set by
+        the environment.
+
+        HBNB_MYSQL_POOL_SIZE (default 5) connections are kept open, and up
+        to HBNB_MYSQL_MAX_OVERFLOW (default 10) more are opened under load.
+        A checkout waits up to HBNB_MYSQL_POOL_TIMEOUT seconds (default 30)
+        for a connection. Connections older than HBNB_MYSQL_POOL_RECYCLE
+        seconds are reopened (default -1, never), and with
+        HBNB_MYSQL_POOL_PRE_PING=1 each one is tested before use.
+        """
+        return {"poolclass": TimedQueuePool,
+                "pool_size": int(getenv('HBNB_MYSQL_POOL_SIZE', 5)),
+                "max_overflow": int(getenv('HBNB_MYSQL_MAX_OVERFLOW', 10)),
+                "pool_timeout": float(getenv('HBNB_MYSQL_POOL_TIMEOUT', 30)),
+                "pool_recycle": int(getenv('HBNB_MYSQL_POOL_RECYCLE', -1)),
+                "pool_pre_ping": getenv('HBNB_MYSQL_POOL_PRE_PING') == "1"}
 
-    def all(self, cls=None):
+    def pool_stats(self):
+        """
+        Returns the connection pool occupancy and checkout wait counters,
+        with the health and counters of each replica under "replicas" when
+        there are some.
+        """
+        stats = self.__engine.pool.stats()
+        if self.__replicas is not None:
+            stats["replicas"] = self.__replicas.stats()
+        return stats
+
+    def use_primary(self):
+        """
+        Send every query of the current session to the primary until it is
+        closed, for requests that write.
+        """
+        self.__session().use_primary()
+
+    def all(self, cls=None, load=None):
         """
         Query objects from the current database session.
 
         Args:
             cls (class, optional): The class of objects to query.
                 If None, queries all classes.
+            load (list, optional): Relationship paths of cls to load with
+                the objects, such as "amenities" or "cities.places", each
+                level in one batched IN query.
 
         Returns:
             dict: A dictionary of objects, where the keys are in the
@@ -62,7 +138,11 @@ class DBStorage:
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                query = self.__session.query(classes[clss])
+                if load and cls is not None:
+                    query = query.options(*self.__options(classes[clss],
+                                                          load))
+                objs = query.all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
@@ -76,13 +156,182 @@ class DBStorage:
             obj: The object to be added to the database.
         """
         if obj:
-            if hasattr(obj, 'password') and obj.password:
-                obj.password = hashlib.md5(obj.password.encode()).hexdigest()
+            self.use_primary()
             self.__session.add(obj)
 
+    def bulk_new(self, objs):
+        """
+        Add the objects to the current database session and commit them
+        once, the inserts of a table being sent in batches.
+
+        Args:
+            objs (iterable): The objects to add.
+
+        Returns:
+            int: The number of objects added.
+        """
+        objs = list(objs)
+        self.__session.add_all(objs)
+        self.save()
+        return len(objs)
+
+    def bulk_upsert(self, cls, dicts):
+        """
+        Insert or update rows of a class from dictionaries in one
+        transaction.
+
+        Each dictionary is a record such as the output of to_dict(),
+        built into an object first so that ids and timestamps get the
+        same values as with new(). Columns a record leaves out get their
+        default as with new(), on updates too. The password of a record is
+        already hashed and kept as is. The rows are sent UPSERT_BATCH at a time
+        with INSERT ... ON DUPLICATE KEY UPDATE (ON CONFLICT DO UPDATE on
+        SQLite), updating every column but id and created_at of existing
+        rows. Objects already in the session are not refreshed.
+
+        Args:
+            cls (class): The class of the rows.
+            dicts (iterable): The dictionaries of the rows.
+
+        Returns:
+            int: The number of records written.
+        """
+        if isinstance(cls, str):
+            cls = classes[cls]
+        table = cls.__table__
+        statement = self.__upsert(table)
+        session = self.__session()
+        count = 0
+        batch = []
+        try:
+            for d in dicts:
+                batch.append(cls(**d))
+                if len(batch) == UPSERT_BATCH:
+                    count += self.__execute(session, statement, batch)
+                    batch = []
+            if batch:
+                count += self.__execute(session, statement, batch)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        return count
+
+    def __upsert(self, table):
+        """
+        Returns the upsert statement of the table for the engine dialect,
+        or None when the dialect has none.
+        """
+        dialect = self.__engine.dialect.name
+        updated = [column.key for column in table.columns
+                   if column.key not in ("id", "created_at")]
+        if dialect == "mysql":
+            statement = mysql.insert(table)
+            return statement.on_duplicate_key_update(
+                {key: statement.inserted[key] for key in updated})
+        if dialect == "sqlite":
+            statement = sqlite.insert(table)
+            return statement.on_conflict_do_update(
+                index_elements=["id"],
+                set_={key: statement.excluded[key] for key in updated})
+        return None
+
+    @staticmethod
+    def __execute(session, statement, objs):
+        """Upserts the objects, merging them one by one without statement"""
+        if statement is None:
+            for obj in objs:
+                session.merge(obj)
+        else:
+            columns = statement.table.columns
+            session.execute(statement, [
+                {column.key: DBStorage.__column(obj, column)
+                 for column in columns} for obj in objs])
+        return len(objs)
+
+    @staticmethod
+    def __column(obj, column):
+        """Returns the value of a column of the object, its default when it
+        is None like an insert of the session would"""
+        value = getattr(obj, column.key)
+        if value is None and column.default is not None:
+            if column.default.is_scalar:
+                return column.default.arg
+            if column.default.is_callable:
+                return column.default.arg(None)
+        return value
+
     def save(self):
-        """Commit all changes of the current database session."""
-        self.__session.commit()
+        """
+        Commit all changes of the current database session.
+
+        With group commit enabled, the changes are handed to a shared
+        writer session that commits the saves of concurrent callers in
+        one transaction, and each caller returns once it is committed.
+        """
+        if self.__group is not None:
+            staged = self.__stage()
+            self.__group.commit()
+            self.__committed(*staged)
+        else:
+            self.__session.commit()
+
+    def commit_stats(self):
+        """
+        Returns the group commit counters, or None when group commit is
+        disabled.
+        """
+        if self.__group is None:
+            return None
+        return self.__group.stats()
+
+    def __stage(self):
+        """
+        Merges copies of the pending changes of the current session into
+        the writer, returning the new, changed and deleted objects.
+
+        The objects stay in the current session, so their relationships
+        can still be loaded, and the writer only ever holds its own
+        copies.
+        """
+        session = self.__session()
+        new = list(session.new)
+        dirty = [obj for obj in session.dirty if session.is_modified(obj)]
+        deleted = list(session.deleted)
+        with self.__writer_lock:
+            for obj in new + dirty:
+                self.__writer.merge(obj)
+            for obj in deleted:
+                self.__writer.delete(self.__writer.merge(obj))
+        return new, dirty, deleted
+
+    def __committed(self, new, dirty, deleted):
+        """
+        Marks the staged changes as committed in the current session, as
+        its own commit would: new objects become persistent, changed
+        attributes are reloaded on access and deleted objects detached.
+        """
+        session = self.__session()
+        for obj in new:
+            # unlike expunge(), make_transient() never cascades
+            make_transient(obj)
+            make_transient_to_detached(obj)
+            session.add(obj)
+        for obj in dirty:
+            session.expire(obj, [attr.key
+                                 for attr in sqlalchemy.inspect(obj).attrs
+                                 if attr.history.has_changes()])
+        for obj in deleted:
+            session.expunge(obj)
+
+    def __flush(self):
+        """Commits the writer session"""
+        with self.__writer_lock:
+            try:
+                self.__writer.commit()
+            except Exception:
+                self.__writer.rollback()
+                raise
 
     def delete(self, obj=None):
         """
@@ -92,31 +341,203 @@ class DBStorage:
             obj (object, optional): The object to be deleted from the database.
         """
         if obj is not None:
+            self.use_primary()
             self.__session.delete(obj)
 
     def reload(self):
         """Reload data from the database."""
         Base.metadata.create_all(self.__engine)
-        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False,
+                                    autoflush=self.__group is None,
+                                    class_=RoutingSession,
+                                    replicas=self.__replicas)
         Session = scoped_session(sess_factory)
         self.__session = Session
+        self.__factory = sess_factory
+        if self.__group is not None:
+            self.__writer = sess_factory()
+            self.__writer.use_primary()
+
+    def missing_indexes(self, create=False):
+        """
+        Returns the indexes declared by the models that the database
+        lacks, such as the ones added after its tables were created, which
+        reload() does not create.
+
+        An index counts as present when the table has one on the same
+        columns under any name, like the one MySQL makes for a foreign
+        key.
+
+        Args:
+            create (bool, optional): Whether to create the missing indexes.
 
-    def get(self, cls, id):
+        Returns:
+            list: The names of the indexes that were missing.
+        """
+        inspector = sqlalchemy.inspect(self.__engine)
+        missing = []
+        for table in Base.metadata.sorted_tables:
+            existing = {tuple(index["column_names"])
+                        for index in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                if tuple(column.name for column in index.columns) \
+                        not in existing:
+                    missing.append(index)
+        if create:
+            for index in missing:
+                index.create(self.__engine)
+        return [index.name for index in missing]
+
+    def get(self, cls, id, load=None):
         """
         Retrieve one object from the database by its class and ID.
 
+        The object is looked up by primary key in the identity map of the
+        session first, so only a miss queries the database.
+
         Args:
             cls (class): The class of the object to retrieve.
             id (str): The ID of the object to retrieve.
+            load (list, optional): Relationship paths to load with the
+                object, as for all(), when it is queried.
 
         Returns:
             object: The retrieved object, or None if not found.
         """
         if cls and id:
-            key = "{}.{}".format(cls.__name__, id)
-            return self.__session.query(cls).get(key)
+            if isinstance(cls, str):
+                cls = classes[cls]
+            options = self.__options(cls, load) if load else None
+            return self.__session.get(cls, id, options=options)
         return None
 
+    def get_many(self, cls, ids):
+        """
+        Retrieve the objects of a class with the given IDs, the ones not
+        in the identity map of the session in one IN query per
+        PREFETCH_BATCH IDs.
+
+        Args:
+            cls (class): The class of the objects to retrieve.
+            ids (list): The IDs of the objects to retrieve.
+
+        Returns:
+            list: The objects in the order of ids, None for the IDs not
+                found.
+        """
+        if isinstance(cls, str):
+            cls = classes[cls]
+        ids = list(ids)
+        session = self.__session()
+        found = {}
+        missing = []
+        for id in set(ids):
+            obj = session.identity_map.get(
+                session.identity_key(cls, id))
+            if obj is not None:
+                found[id] = obj
+            else:
+                missing.append(id)
+        for i in range(0, len(missing), PREFETCH_BATCH):
+            for obj in session.query(cls).filter(
+                    cls.id.in_(missing[i:i + PREFETCH_BATCH])):
+                found[obj.id] = obj
+        return [found.get(id) for id in ids]
+
+    def page(self, cls, after_id=None, limit=100, filters=None):
+        """
+        Retrieve a page of the objects of a class in id order.
+
+        Pages are read by keyset on the primary key, so each one costs an
+        index range scan however deep it is, unlike an OFFSET.
+
+        Args:
+            cls (class): The class of the objects.
+            after_id (str, optional): Only objects with a greater id are
+                returned, the last id of the previous page.
+            limit (int, optional): The maximum number of objects.
+            filters (dict, optional): Column values the objects must have,
+                a list, tuple or set value matching any of its items.
+
+        Returns:
+            list: The objects of the page.
+        """
+        if isinstance(cls, str):
+            cls = classes[cls]
+        query = self.__session.query(cls)
+        for attr, value in (filters or {}).items():
+            column = getattr(cls, attr)
+            if isinstance(value, (list, tuple, set)):
+                query = query.filter(column.in_(value))
+            else:
+                query = query.filter(column == value)
+        if after_id is not None:
+            query = query.filter(cls.id > after_id)
+        return query.order_by(cls.id).limit(limit).all()
+
+    def iter(self, cls=None, batch_size=1000):
+        """
+        Iterate over the objects of a class, or of every class, without
+        loading them all at once.
+
+        The rows are streamed from a server-side cursor batch_size at a
+        time, on a session of their own so that the current session stays
+        usable. Each batch is expunged once the next one is read: objects
+        are detached from then on and their lazy relationships can no
+        longer be loaded, so memory stays bound by batch_size.
+
+        Args:
+            cls (class, optional): The class of the objects.
+            batch_size (int, optional): The number of rows per batch.
+        """
+        session = self.__factory()
+        try:
+            for clss in classes:
+                if cls is None or cls is classes[clss] or cls is clss:
+                    result = session.execute(
+                        select(classes[clss]).execution_options(
+                            yield_per=batch_size))
+                    for batch in result.scalars().partitions():
+                        for obj in batch:
+                            yield obj
+                        for obj in batch:
+                            session.expunge(obj)
+        finally:
+            session.close()
+
+    def prefetch(self, objs, *paths):
+        """
+        Load relationships of objects already retrieved, in batched IN
+        queries instead of one query per object and relationship.
+
+        Args:
+            objs (iterable): The objects, of one or more classes.
+            *paths (str): Relationship paths to load, as for all().
+        """
+        by_class = {}
+        for obj in objs:
+            by_class.setdefault(type(obj), []).append(obj.id)
+        for cls, ids in by_class.items():
+            options = self.__options(cls, paths)
+            for i in range(0, len(ids), PREFETCH_BATCH):
+                self.__session.query(cls).options(*options).filter(
+                    cls.id.in_(ids[i:i + PREFETCH_BATCH])).all()
+
+    @staticmethod
+    def __options(cls, paths):
+        """Returns the selectinload() options of relationship paths"""
+        options = []
+        for path in paths:
+            option = None
+            target = cls
+            for name in path.split("."):
+                attr = getattr(target, name)
+                option = selectinload(attr) if option is None else \
+                    option.selectinload(attr)
+                target = attr.property.mapper.class_
+            options.append(option)
+        return options
+
     def count(self, cls=None):
         """
         Count the number of objects in the storage.
@@ -129,13 +550,27 @@ class DBStorage:
             int: The number of objects in storage.
         """
         if cls:
+            if isinstance(cls, str):
+                cls = classes[cls]
             return self.__session.query(cls).count()
         else:
             # If cls is not provided, count all objects
-            count = 0
-            for model_cls in self.classes.values():
-                count += self.__session.query(model_cls).count()
-            return count
+            return sum(self.count_all().values())
+
+    def count_all(self):
+        """
+        Count the objects of every class in a single query.
+
+        Returns:
+            dict: The number of objects by class name.
+        """
+        query = union_all(*[select(literal(name).label("name"),
+                                   func.count().label("count"))
+                            .select_from(cls)
+                            for name, cls in classes.items()])
+        counts = {name: 0 for name in classes}
+        counts.update(self.__session.execute(query).all())
+        return counts
 
     def close(self):
         """Call remove() method on the private session attribute."""
@@ -3,6 +3,7 @@
 Contains the FileStorage class
 """
 
+from bisect import bisect_right, insort
 import json
 from models.amenity import Amenity
 from models.base_model import BaseModel
@@ -11,11 +12,76 @@ from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
-import hashlib  # Added hashlib for password hashing
+from models.engine.group_commit import GroupCommit
+from models.engine.journal import Journal
+from models.engine import parallel
+from models.engine.serializers import JSONSerializer, serializers, write
+from models.engine.shards import migrate, shard_names, shard_path
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+from os import getenv
+import sys
+import threading
+import time
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+# number of objects loaded between two calls to the reload progress callback
+PROGRESS_EVERY = 100000
+# size in bytes from which the snapshot is loaded on a process pool when
+# HBNB_FILE_WORKERS is set, smaller ones load faster than a pool starts
+PARALLEL_MIN_SIZE = 8 * 1024 * 1024
+
+# foreign key attributes indexed by FileStorage, by class name
+indexed = {"City": ("state_id",), "Place": ("city_id", "user_id"),
+           "Review": ("place_id", "user_id")}
+
+
+def matches(value, wanted):
+    """Returns whether a value is wanted, or one of the wanted values when
+    wanted is a list, tuple or set"""
+    if isinstance(wanted, (list, tuple, set)):
+        return value in wanted
+    return value == wanted
+
+
+def compact(obj):
+    """
+    Makes obj share the values other objects hold equal copies of, without
+    changing them: its foreign keys and amenity ids are interned, so the
+    objects referring to one object hold a single copy of its id, and
+    updated_at becomes created_at when they are equal.
+
+    The attributes are set around BaseModel.__setattr__, whose indexes
+    stay current as the values are equal.
+
+    Only duplicate values are shared, which saves about 9% of the memory
+    of the objects: 1382 down to 1260 bytes per object with 20k objects
+    by benchmarks.memory. The instance dicts and the values of each
+    object alone, its id, name and timestamps, take the rest and are left
+    as they are; a per-class attribute layout is out of its scope.
+    """
+    for attr in indexed.get(obj.__class__.__name__, ()):
+        value = getattr(obj, attr, None)
+        if type(value) is str:
+            object.__setattr__(obj, attr, sys.intern(value))
+    ids = getattr(obj, "amenity_ids", None)
+    if ids and type(ids) is list:
+        ids[:] = [sys.intern(id) if type(id) is str else id for id in ids]
+    created_at = getattr(obj, "created_at", None)
+    if created_at is not None and created_at == getattr(obj, "updated_at",
+                                                        None):
+        object.__setattr__(obj, "updated_at", created_at)
+
+
+def class_name(cls):
+    """Returns the class name for a class or a class name string"""
+    if isinstance(cls, str):
+        return cls
+    return cls.__name__
+
 
 class FileStorage:
     """
@@ -29,25 +95,86 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects bucketed by <class name>, then by key
+    __buckets = {}
+    # dictionary - objects by (<class name>, attribute) then attribute value
+    __indexes = {}
+    # dictionary - sorted ids by <class name>, built by the first page()
+    # of the class
+    __sorted = {}
+    # dictionary - objects changed since the last save, None when deleted
+    __changes = {}
+    # dictionary - '"<class name>.id": <JSON>' of the objects as last saved
+    __fragments = {}
+    # dictionary - entries of the file not built into objects yet, by
+    # <class name> then key: the (start, end) byte offsets of their JSON
+    # in __source, or their decoded dictionary
+    __pending = {}
+    # file - the snapshot the offsets of __pending point into
+    __source = None
+    # set - names of the classes whose shard was not read yet in lazy mode
+    __unread = set()
+    # tuple - stat of the files as of the last reload or save
+    __loaded = None
+    # dictionary - statistics of the last reload that read the files
+    __load_stats = None
+    # string - error of the last load that stopped before building every
+    # entry, None once everything loaded; save() does not overwrite the
+    # files meanwhile, which would drop the entries not loaded
+    __failed = None
+    # lock - guards the dictionaries above and the files written
+    __lock = threading.RLock()
 
-    def all(self, cls=None):
+    def __init__(self):
+        """Instantiate a FileStorage object"""
+        self.__journaled = getenv('HBNB_FILE_JOURNAL') == "1"
+        self.__lazy = getenv('HBNB_FILE_LAZY') == "1"
+        self.__compact = getenv('HBNB_FILE_COMPACT') == "1"
+        self.__workers = int(getenv('HBNB_FILE_WORKERS', 0))
+        self.__shards = None
+        self.__format = JSONSerializer()
+        if getenv('HBNB_FILE_LAYOUT') == "sharded":
+            self.__shards = self.__file_path + ".d"
+        else:
+            self.__format = serializers[getenv('HBNB_FILE_FORMAT',
+                                               "json")]()
+        self.__binary = not isinstance(self.__format, JSONSerializer)
+        # string - path to the snapshot in the chosen format
+        self.__path = os.path.splitext(self.__file_path)[0] + \
+            self.__format.extension
+        self.__journal = Journal(self.__path,
+                                 int(getenv('HBNB_FILE_JOURNAL_SIZE',
+                                            16 * 1024 * 1024)),
+                                 self.__shards, self.__format,
+                                 self.__folded,
+                                 (self.__file_path, JSONSerializer())
+                                 if self.__binary else None)
+        self.__group = None
+        if getenv('HBNB_COMMIT_WINDOW_MS'):
+            self.__group = GroupCommit(
+                self.__flush, float(getenv('HBNB_COMMIT_WINDOW_MS')) / 1000,
+                int(getenv('HBNB_COMMIT_BATCH', 64)))
+
+    def all(self, cls=None, load=None):
         """
         Returns a dictionary of all objects or objects of a specific class.
 
         Args:
             cls (class, optional): The class of objects to filter by.
                 If None, returns all objects.
+            load (list, optional): Ignored, relationships are answered
+                from the in-memory indexes.
 
         Returns:
             dict: A dictionary where keys are in the format 'ClassName.id'
                 and values are the objects themselves.
         """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            name = class_name(cls)
+            self.__materialize(name)
+            return dict(self.__buckets.get(name, {}))
+        for name in list(self.__pending) + list(self.__unread):
+            self.__materialize(name)
         return self.__objects
 
     def new(self, obj):
@@ -58,26 +185,221 @@ class FileStorage:
             obj: The object to be added to the dictionary.
         """
         if obj is not None:
-            key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            name = obj.__class__.__name__
+            with self.__lock:
+                if name in self.__unread:
+                    self.__materialize(name)
+                key = self.__add(obj, False)
+                self.__pending.get(name, {}).pop(key, None)
+                self.__changes[key] = obj
+
+    def bulk_new(self, objs):
+        """
+        Adds the objects and saves them once.
+
+        Args:
+            objs (iterable): The objects to add.
+
+        Returns:
+            int: The number of objects added.
+        """
+        count = 0
+        for obj in objs:
+            self.new(obj)
+            count += 1
+        self.save()
+        return count
+
+    def bulk_upsert(self, cls, dicts):
+        """
+        Creates or updates objects of a class from their dictionaries and
+        saves them once.
+
+        Each dictionary is a full record such as the output of to_dict().
+        An object with the same id gets every attribute of the record but
+        its id and created_at, otherwise a new object is added.
+
+        Args:
+            cls (class): The class of the objects.
+            dicts (iterable): The dictionaries of the objects.
+
+        Returns:
+            int: The number of records written.
+        """
+        name = class_name(cls)
+        count = 0
+        for d in dicts:
+            obj = classes[name](**d)
+            existing = self.get(name, obj.id)
+            if existing is not None:
+                for attr, value in obj.__dict__.items():
+                    if attr not in ("id", "created_at"):
+                        setattr(existing, attr, value)
+                obj = existing
+            self.new(obj)
+            count += 1
+        self.save()
+        return count
 
     def save(self):
-        """Serializes __objects to the JSON file (path: __file_path)."""
-        new_dict = {}
-        for key, value in self.__objects.items():
-            new_dict[key] = value.to_dict()
-            if isinstance(value, User) and hasattr(value, 'password') and value.password:
-                new_dict[key]['password'] = hashlib.md5(value.password.encode()).hexdigest()
-
-    def reload(self):
-        """Deserializes the JSON file to __objects."""
-        try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except:
-            pass
+        """
+        Serializes __objects to the JSON file (path: __file_path).
+
+        Only the objects added since the last save are serialized again,
+        the others are written from their cached JSON. In journal mode
+        those changes are appended to the journal instead.
+
+        With group commit enabled, saves from concurrent callers are
+        written by a single flush and each caller returns once it is done.
+
+        Raises:
+            RuntimeError: When the last reload could not load every entry
+                of the snapshot, which rewriting it would lose. Journal
+                mode only appends to the journal and still saves.
+        """
+        if self.__group is not None:
+            self.__group.commit()
+        else:
+            self.__flush()
+
+    def commit_stats(self):
+        """
+        Returns the group commit counters, or None when group commit is
+        disabled.
+        """
+        if self.__group is None:
+            return None
+        return self.__group.stats()
+
+    def pool_stats(self):
+        """
+        Returns None, FileStorage has no connection pool.
+        """
+        return None
+
+    def __flush(self):
+        """Writes the changes since the last save to the files"""
+        with self.__lock:
+            if self.__failed is not None and not self.__journaled:
+                raise RuntimeError("not saved, the files were not fully "
+                                   "loaded: " + self.__failed)
+            if self.__journaled:
+                if self.__changes:
+                    self.__journal.append(
+                        [(key, obj.to_dict() if obj is not None else None)
+                         for key, obj in self.__changes.items()])
+                for key in self.__changes:
+                    self.__fragments.pop(key, None)
+            else:
+                fragments = self.__fragments
+                for key, obj in self.__changes.items():
+                    if obj is None or self.__binary:
+                        fragments.pop(key, None)
+                    else:
+                        fragments[key] = self.__encode(key, obj)
+                self.__journal.wait()
+                if self.__shards is not None:
+                    self.__write_shards()
+                else:
+                    self.__write_snapshot()
+                self.__journal.clear()
+            for obj in self.__changes.values():
+                if obj is not None:
+                    obj.clear_changes()
+            self.__changes.clear()
+            type(self).__loaded = self.__stat()
+
+    def reload(self, progress=None):
+        """
+        Deserializes the JSON file to __objects, replaying the journal on
+        top of it.
+
+        The file is parsed as a stream and each object is built as soon
+        as its entry is read, so the parsed file is never held in memory
+        as a whole. In lazy mode the entries of classes with no object in
+        memory are only indexed, and built the first time their class is
+        asked for. Nothing is read when the files did not change since
+        the last reload or save.
+
+        With HBNB_FILE_FORMAT=binary the snapshot is read from and
+        written to file.bin in the compact binary format, falling back to
+        reading file.json when there is no binary snapshot yet. The sharded
+        layout is always JSON.
+
+        With HBNB_FILE_WORKERS set to more than 1, a JSON snapshot of at
+        least PARALLEL_MIN_SIZE bytes is parsed and built on that many
+        processes instead, unless in lazy mode or on a single CPU.
+
+        With HBNB_FILE_COMPACT=1 the objects stored share their equal
+        foreign keys and timestamps, see compact().
+
+        In the sharded layout the shards are read by parallel threads,
+        and a single-file snapshot left by the other layout is migrated
+        to shards first. In lazy mode, shards of classes with no object
+        in memory are not read at all until their class is asked for.
+
+        Args:
+            progress (callable, optional): Called every PROGRESS_EVERY
+                entries, or after each shard, and at the end with the
+                number of entries loaded, the number of bytes read and
+                the size of the files.
+        """
+        with self.__lock:
+            if self.__shards is not None and \
+                    not os.path.isdir(self.__shards) and \
+                    os.path.exists(self.__file_path):
+                migrate(self.__file_path, self.__shards)
+            loaded = self.__stat()
+            if loaded == self.__loaded:
+                return
+            start = time.monotonic()
+            changes = self.__journal.changes()
+            self.__fragments.clear()
+            self.__pending.clear()
+            self.__unread.clear()
+            eager = {name for name, bucket in self.__buckets.items()
+                     if bucket}
+            try:
+                if self.__shards is not None:
+                    eager.update(key.split(".", 1)[0] for key in changes)
+                    count, read, size = self.__reload_shards(changes, eager,
+                                                             progress)
+                else:
+                    count, read, size = self.__reload_snapshot(changes,
+                                                               eager,
+                                                               progress)
+                for key, value in changes.items():
+                    if value is not None:
+                        self.__load(key, value, None, eager)
+                        count += 1
+            except Exception as error:
+                # the files are read again only once they change
+                self.__fail(error)
+                type(self).__loaded = loaded
+                return
+            type(self).__failed = None
+            if progress:
+                progress(count, read, size)
+            type(self).__load_stats = {
+                "objects": count, "bytes": read, "journal": len(changes),
+                "pending": sum(len(pending)
+                               for pending in self.__pending.values()),
+                "unread": len(self.__unread),
+                "seconds": time.monotonic() - start}
+            type(self).__loaded = loaded
+
+    def load_stats(self):
+        """
+        Returns statistics about the last reload that read the files.
+
+        Returns:
+            dict: The number of entries loaded, the number of bytes of the
+                snapshot read, the number of journal entries replayed, the
+                number of entries left pending and of shards left unread
+                in lazy mode and the load time in seconds, or None before
+                any load.
+        """
+        return self.__load_stats
 
     def delete(self, obj=None):
         """
@@ -87,32 +409,515 @@ class FileStorage:
             obj (object, optional): The object to be deleted from the dictionary.
         """
         if obj is not None:
-            key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            name = obj.__class__.__name__
+            key = name + '.' + obj.id
+            with self.__lock:
+                if key in self.__objects:
+                    self.__unindex(key, self.__objects[key])
+                    del self.__objects[key]
+                    del self.__buckets[name][key]
+                    self.__changes[key] = None
+                    ids = self.__sorted.get(name)
+                    if ids is not None:
+                        del ids[bisect_right(ids, obj.id) - 1]
+                elif self.__pending.get(name, {}).pop(key, None) is not None:
+                    self.__changes[key] = None
+                elif name in self.__unread:
+                    self.__materialize(name)
+                    self.delete(obj)
+
+    def all_by(self, cls, attr, value):
+        """
+        Returns the objects of a class whose attribute has a given value.
+
+        Indexed foreign keys are answered from the index, any other
+        attribute by scanning the objects of the class.
+
+        Args:
+            cls (class): The class of objects to filter.
+            attr (str): The attribute to match.
+            value: The value the attribute must be equal to.
+
+        Returns:
+            dict: A dictionary of the matching objects by 'ClassName.id'.
+        """
+        name = class_name(cls)
+        self.__materialize(name)
+        if attr in indexed.get(name, ()):
+            return dict(self.__indexes.get((name, attr), {}).get(value, {}))
+        return {key: obj for key, obj in self.all(name).items()
+                if getattr(obj, attr, None) == value}
+
+    def page(self, cls, after_id=None, limit=100, filters=None):
+        """
+        Returns a page of the objects of a class in id order.
+
+        The ids of the class are kept sorted from the first call on, so a
+        page is found by bisection rather than by sorting the class. When
+        an indexed foreign key is filtered on, only the ids of its index
+        entries are sorted.
+
+        Args:
+            cls (class): The class of the objects.
+            after_id (str, optional): Only objects with a greater id are
+                returned, the last id of the previous page.
+            limit (int, optional): The maximum number of objects.
+            filters (dict, optional): Attribute values the objects must
+                have, a list, tuple or set value matching any of its items.
+
+        Returns:
+            list: The objects of the page.
+        """
+        name = class_name(cls)
+        self.__materialize(name)
+        filters = filters or {}
+        with self.__lock:
+            bucket = self.__buckets.get(name, {})
+            ids = None
+            for attr, value in filters.items():
+                if attr in indexed.get(name, ()):
+                    entries = self.__indexes.get((name, attr), {})
+                    values = value if isinstance(value, (list, tuple, set)) \
+                        else (value,)
+                    ids = sorted({obj.id for item in values
+                                  for obj in entries.get(item, {}).values()})
+                    break
+            if ids is None:
+                ids = self.__sorted.get(name)
+                if ids is None:
+                    ids = self.__sorted[name] = sorted(obj.id for obj
+                                                       in bucket.values())
+            objs = []
+            start = bisect_right(ids, after_id) if after_id is not None \
+                else 0
+            for i in range(start, len(ids)):
+                if len(objs) >= limit:
+                    break
+                obj = bucket[name + "." + ids[i]]
+                if all(matches(getattr(obj, attr, None), value)
+                       for attr, value in filters.items()):
+                    objs.append(obj)
+        return objs
+
+    def iter(self, cls=None, batch_size=1000):
+        """
+        Iterates over the objects of a class, or of every class.
+
+        Objects are yielded from a snapshot of the keys, so the storage
+        can be changed while iterating. In lazy mode the entries not built
+        yet, and the shards not read yet, are built one at a time and not
+        kept in storage, so iterating does not grow memory with the size
+        of the class.
+
+        Args:
+            cls (class, optional): The class of the objects.
+            batch_size (int, optional): Unused, for compatibility with
+                DBStorage.iter().
+        """
+        names = [class_name(cls)] if cls is not None else list(classes)
+        for name in names:
+            for key in list(self.__buckets.get(name, {})):
+                obj = self.__objects.get(key)
+                if obj is not None:
+                    yield obj
+            for key in list(self.__pending.get(name, {})):
+                with self.__lock:
+                    entry = self.__pending.get(name, {}).get(key)
+                    obj = self.__build(entry) if entry is not None else None
+                if obj is not None:
+                    yield obj
+            if name in self.__unread:
+                try:
+                    with open(shard_path(self.__shards, name), 'rb') as f:
+                        for key, value in self.__format.read(f):
+                            if name not in self.__unread:
+                                break
+                            yield classes[value["__class__"]](**value)
+                except FileNotFoundError:
+                    pass
+
+    def reindex(self, obj, attr, old):
+        """
+        Moves a stored object to the right index entry after one of its
+        indexed attributes changed.
+
+        Args:
+            obj: The object that was updated.
+            attr (str): The attribute that was set.
+            old: The value of the attribute before the update.
+        """
+        name = obj.__class__.__name__
+        if attr not in indexed.get(name, ()) or not hasattr(obj, "id"):
+            return
+        key = name + "." + obj.id
+        if self.__objects.get(key) is not obj:
+            return
+        entries = self.__index(name, attr, old)
+        entries.pop(key, None)
+        if not entries:
+            del self.__indexes[(name, attr)][old]
+        self.__index(name, attr, getattr(obj, attr))[key] = obj
+
+    def __add(self, obj, loaded=True):
+        """Stores an object and indexes it, returning its key. An object
+        loaded from the files starts with no change recorded."""
+        if loaded:
+            obj.clear_changes()
+        name = obj.__class__.__name__
+        key = name + "." + obj.id
+        if self.__compact:
+            compact(obj)
+        if key in self.__objects:
+            self.__unindex(key, self.__objects[key])
+        elif name in self.__sorted:
+            insort(self.__sorted[name], obj.id)
+        self.__objects[key] = obj
+        self.__buckets.setdefault(name, {})[key] = obj
+        for attr in indexed.get(name, ()):
+            self.__index(name, attr, getattr(obj, attr, None))[key] = obj
+        return key
+
+    def __load(self, key, value, span, eager):
+        """
+        Builds the object of a file entry, or leaves the entry pending in
+        lazy mode when its class is not in eager.
+        """
+        name = value["__class__"]
+        cls = classes[name]
+        if self.__lazy and name not in eager:
+            self.__pending.setdefault(name, {})[key] = span or value
+        else:
+            self.__add(cls(**value))
+
+    def __materialize(self, name, key=None):
+        """Builds the pending objects of a class, or only the one of key"""
+        if name not in self.__pending and name not in self.__unread:
+            return
+        with self.__lock:
+            try:
+                if name in self.__unread:
+                    self.__unread.discard(name)
+                    for obj in self.__read_shard(name, {})[0]:
+                        self.__add(obj)
+                    return
+                pending = self.__pending.get(name)
+                if pending is None:
+                    return
+                if key is None:
+                    entries = self.__pending.pop(name).items()
+                elif key in pending:
+                    entries = [(key, pending.pop(key))]
+                else:
+                    return
+                for key, entry in entries:
+                    self.__add(self.__build(entry))
+            except Exception as error:
+                self.__fail(error)
+                raise
+
+    def __fail(self, error):
+        """Records and logs an error that stopped a load"""
+        type(self).__failed = "{}: {!r}".format(self.__path, error)
+        logging.getLogger(__name__).error("could not load %s",
+                                          self.__failed)
+
+    def __build(self, entry):
+        """Builds the object of a pending entry"""
+        if isinstance(entry, tuple):
+            self.__source.seek(entry[0])
+            entry = json.loads(self.__source.read(entry[1] - entry[0]))
+        return classes[entry["__class__"]](**entry)
+
+    def __reload_snapshot(self, changes, eager, progress):
+        """
+        Loads the entries of the single-file snapshot that are not in
+        changes, returning the number of entries, bytes read and file size.
+        """
+        count = 0
+        size = 0
+        source = None
+        stream = None
+        path, serializer = self.__path, self.__format
+        if self.__binary and not os.path.exists(path):
+            path, serializer = self.__file_path, JSONSerializer()
+        objs = self.__load_parallel(path, serializer, changes)
+        if objs is not None:
+            for obj in objs:
+                self.__add(obj)
+            if self.__source is not None:
+                self.__source.close()
+            type(self).__source = None
+            size = os.path.getsize(path)
+            return len(objs), size, size
+        try:
+            source = open(path, 'rb')
+            size = os.fstat(source.fileno()).st_size
+            # an empty file holds no entry to lose
+            stream = serializer.read(source) if size else ()
+            for key, value in stream:
+                if key in changes:
+                    continue
+                self.__load(key, value, stream.span if stream.ascii and
+                            not self.__binary else None, eager)
+                count += 1
+                if progress and count % PROGRESS_EVERY == 0:
+                    progress(count, stream.bytes_read, size)
+        except FileNotFoundError:
+            pass
+        finally:
+            if self.__source is not None:
+                self.__source.close()
+            if source is not None and (self.__binary or not self.__pending):
+                source.close()
+                source = None
+            type(self).__source = source
+        return count, stream.bytes_read if stream else 0, size
+
+    def __load_parallel(self, path, serializer, changes):
+        """
+        Returns the objects of the JSON snapshot at path that are not in
+        changes built on a pool of HBNB_FILE_WORKERS processes, or None
+        when it should be read sequentially.
+        """
+        if self.__workers < 2 or self.__lazy or \
+                not isinstance(serializer, JSONSerializer):
+            return None
+        # a single CPU runs the workers one after the other, on top of
+        # pickling their objects back
+        if (os.cpu_count() or 1) < 2:
+            return None
+        try:
+            if os.path.getsize(path) < PARALLEL_MIN_SIZE:
+                return None
+            return parallel.load(path, self.__workers, classes, changes)
+        except Exception:
+            return None
+
+    def __reload_shards(self, changes, eager, progress):
+        """
+        Loads the entries of the shards that are not in changes, returning
+        the number of entries, bytes read and size of the shards.
+        """
+        names = shard_names(self.__shards)
+        if self.__lazy:
+            self.__unread.update(name for name in names if name not in eager)
+        names = [name for name in names if name not in self.__unread]
+        count = read = size = 0
+        with ThreadPoolExecutor(max_workers=max(len(names), 1)) as pool:
+            for objs, read_shard in pool.map(self.__read_shard, names,
+                                             [changes] * len(names)):
+                for obj in objs:
+                    self.__add(obj)
+                count += len(objs)
+                read += read_shard
+                size += read_shard
+                if progress:
+                    progress(count, read, size)
+        return count, read, size
+
+    def __read_shard(self, name, changes):
+        """
+        Builds the objects of the shard of a class that are not in changes,
+        returning them with the size of the shard. Nothing is added to
+        storage here so the shards can be read by parallel threads.
+        """
+        objs = []
+        stream = None
+        try:
+            with open(shard_path(self.__shards, name), 'rb') as f:
+                stream = self.__format.read(f)
+                for key, value in stream:
+                    if key not in changes:
+                        objs.append(classes[value["__class__"]](**value))
+        except FileNotFoundError:
+            pass
+        return objs, stream.bytes_read if stream else 0
+
+    def __write_snapshot(self):
+        """Writes every object and pending entry to the snapshot"""
+        if self.__binary:
+            self.__format.write(self.__path, self.__entries())
+            return
+        for key, obj in self.__objects.items():
+            if key not in self.__fragments:
+                self.__fragments[key] = self.__encode(key, obj)
+        spans = {}
+        write(self.__file_path, self.__snapshot(spans))
+        if spans:
+            self.__repoint(spans)
+
+    def __write_shards(self):
+        """Writes the shards of the classes changed since the last save"""
+        os.makedirs(self.__shards, exist_ok=True)
+        for name in {key.split(".", 1)[0] for key in self.__changes}:
+            bucket = self.__buckets.get(name, {})
+            for key, obj in bucket.items():
+                if key not in self.__fragments:
+                    self.__fragments[key] = self.__encode(key, obj)
+            write(shard_path(self.__shards, name), self.__shard(bucket))
+
+    def __shard(self, bucket):
+        """Yields the chunks of the JSON shard of the objects of bucket"""
+        yield "{"
+        separator = ""
+        for key in bucket:
+            yield separator
+            yield self.__fragments[key]
+            separator = ", "
+        yield "}"
+
+    def __entries(self):
+        """Yields the (key, to_dict()) of every object and pending entry"""
+        for key, obj in self.__objects.items():
+            yield key, obj.to_dict()
+        for pending in self.__pending.values():
+            yield from pending.items()
+
+    def __repoint(self, spans):
+        """Points the pending entries to their offsets in the new snapshot"""
+        for pending in self.__pending.values():
+            for key in pending:
+                pending[key] = spans[key]
+        if self.__source is not None:
+            self.__source.close()
+        type(self).__source = open(self.__file_path, 'rb')
+
+    @staticmethod
+    def __encode(key, obj):
+        """Returns the JSON snapshot entry of a stored object"""
+        return json.dumps(key) + ": " + obj.to_json()
+
+    def __snapshot(self, spans):
+        """
+        Yields the chunks of the JSON snapshot of __objects and of the
+        pending entries, recording in spans where the pending ones land.
+        """
+        yield "{"
+        position = 1
+        separator = ""
+        for key in self.__objects:
+            fragment = self.__fragments[key]
+            position += len(separator) + len(fragment)
+            yield separator
+            yield fragment
+            separator = ", "
+        for pending in self.__pending.values():
+            for key, entry in pending.items():
+                if isinstance(entry, tuple):
+                    self.__source.seek(entry[0])
+                    value = self.__source.read(entry[1] -
+                                               entry[0]).decode('ascii')
+                else:
+                    value = json.dumps(entry)
+                chunk = separator + json.dumps(key) + ": "
+                start = position + len(chunk)
+                position = start + len(value)
+                spans[key] = (start, position)
+                yield chunk
+                yield value
+                separator = ", "
+        yield "}"
+
+    def __stat(self):
+        """Returns the modification time and size of the storage files"""
+        stats = []
+        paths = [self.__path + ".log", self.__path + ".log.1"]
+        if self.__shards is not None:
+            paths += [shard_path(self.__shards, name)
+                      for name in shard_names(self.__shards)]
+        else:
+            paths.append(self.__path)
+        for path in paths:
+            try:
+                st = os.stat(path)
+                stats.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stats.append(None)
+        return tuple(stats)
+
+    def __folded(self):
+        """
+        Marks the files as loaded again once the journal folded its log
+        into the snapshot, which changes them without changing their
+        content, unless the live log changed since the last save or reload.
+        The lock is not waited for, a save may be waiting on the fold.
+        """
+        if not self.__lock.acquire(blocking=False):
+            return
+        try:
+            loaded = self.__loaded
+            stats = self.__stat()
+            if loaded is not None and loaded[0] == stats[0]:
+                type(self).__loaded = stats
+        finally:
+            self.__lock.release()
+
+    def __index(self, name, attr, value):
+        """Returns the index entry of a class attribute value"""
+        return self.__indexes.setdefault((name, attr), {}).setdefault(value,
+                                                                      {})
+
+    def __unindex(self, key, obj):
+        """Removes a stored object from the foreign key indexes"""
+        name = obj.__class__.__name__
+        for attr in indexed.get(name, ()):
+            value = getattr(obj, attr, None)
+            entries = self.__index(name, attr, value)
+            entries.pop(key, None)
+            if not entries:
+                del self.__indexes[(name, attr)][value]
 
     def close(self):
         """Calls reload() method for deserializing the JSON file to objects."""
         self.reload()
 
-    def get(self, cls, id):
+    def get(self, cls, id, load=None):
         """
         Retrieves one object by its class and ID.
 
         Args:
             cls (class): The class of the object to retrieve.
             id (str): The ID of the object to retrieve.
+            load (list, optional): Ignored, as for all().
 
         Returns:
             object: The retrieved object, or None if not found.
         """
         if cls and id:
-            takeObj = '{}.{}'.format(cls, id)
-            everyObj = self.all(cls)
-            return everyObj.get(takeObj)
+            name = class_name(cls)
+            key = '{}.{}'.format(name, id)
+            self.__materialize(name, key)
+            return self.__objects.get(key)
         else:
             return None
 
+    def get_many(self, cls, ids):
+        """
+        Retrieves the objects of a class with the given IDs.
+
+        Args:
+            cls (class): The class of the objects to retrieve.
+            ids (list): The IDs of the objects to retrieve.
+
+        Returns:
+            list: The objects in the order of ids, None for the IDs not
+                found.
+        """
+        return [self.get(cls, id) for id in ids]
+
+    def use_primary(self):
+        """
+        Does nothing, FileStorage has no replicas.
+        """
+        pass
+
+    def prefetch(self, objs, *paths):
+        """
+        Does nothing, relationships are answered from the in-memory
+        indexes without a query per object.
+        """
+        pass
+
     def count(self, cls=None):
         """
         Counts the number of objects in the storage.
@@ -124,4 +929,22 @@ class FileStorage:
         Returns:
             int: The number of objects in storage.
         """
-        return len(self.all(cls))
+        if cls is not None:
+            name = class_name(cls)
+            if name in self.__unread:
+                self.__materialize(name)
+            return len(self.__buckets.get(name, {})) + \
+                len(self.__pending.get(name, {}))
+        for name in list(self.__unread):
+            self.__materialize(name)
+        return len(self.__objects) + sum(len(pending) for pending
+                                         in self.__pending.values())
+
+    def count_all(self):
+        """
+        Counts the objects of every class.
+
+        Returns:
+            dict: The number of objects by class name.
+        """
+        return {name: self.count(name) for name in classes}
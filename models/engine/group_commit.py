@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+Contains the GroupCommit class
+"""
+
+import threading
+import time
+
+
+class Ticket:
+    """A save waiting for the flush that makes it durable"""
+
+    def __init__(self):
+        """Instantiate a Ticket"""
+        self.done = threading.Event()
+        self.error = None
+
+
+class GroupCommit:
+    """
+    Coalesces the saves of concurrent callers into a single flush.
+
+    A background thread waits up to window seconds after the first
+    pending save, or until batch_size saves are pending, then calls
+    flush once for all of them. Each caller blocks in commit() until
+    that flush returned, and gets its exception if it raised.
+    """
+
+    def __init__(self, flush, window, batch_size):
+        """Instantiate a GroupCommit calling flush for each batch"""
+        self.flush = flush
+        self.window = window
+        self.batch_size = batch_size
+        self.__pending = []
+        self.__cond = threading.Condition()
+        self.__thread = None
+        self.__stats = {"flushes": 0, "saves": 0, "max_batch": 0,
+                        "flush_time": 0.0, "max_flush_time": 0.0}
+
+    def commit(self):
+        """Waits until a flush that started after this call completed"""
+        ticket = Ticket()
+        with self.__cond:
+            self.__pending.append(ticket)
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run,
+                                                 daemon=True)
+                self.__thread.start()
+            self.__cond.notify()
+        ticket.done.wait()
+        if ticket.error is not None:
+            raise ticket.error
+
+    def stats(self):
+        """
+        Returns the group commit counters.
+
+        Returns:
+            dict: The number of flushes and saves, the largest batch, the
+                mean batch size and the total, mean and largest flush
+                latency in seconds.
+        """
+        with self.__cond:
+            stats = dict(self.__stats)
+        flushes = stats["flushes"] or 1
+        stats["mean_batch"] = stats["saves"] / flushes
+        stats["mean_flush_time"] = stats["flush_time"] / flushes
+        return stats
+
+    def __run(self):
+        """Flushes the pending saves batch after batch"""
+        while True:
+            with self.__cond:
+                while not self.__pending:
+                    self.__cond.wait()
+                deadline = time.monotonic() + self.window
+                while len(self.__pending) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.__cond.wait(remaining)
+                batch = self.__pending[:self.batch_size]
+                del self.__pending[:self.batch_size]
+            start = time.monotonic()
+            error = None
+            try:
+                self.flush()
+            except Exception as e:
+                error = e
+            elapsed = time.monotonic() - start
+            with self.__cond:
+                stats = self.__stats
+                stats["flushes"] += 1
+                stats["saves"] += len(batch)
+                stats["max_batch"] = max(stats["max_batch"], len(batch))
+                stats["flush_time"] += elapsed
+                stats["max_flush_time"] = max(stats["max_flush_time"],
+                                              elapsed)
+            for ticket in batch:
+                ticket.error = error
+                ticket.done.set()
@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+"""
+Checks that the database has the indexes declared by the models, and
+creates the missing ones.
+
+Usage: HBNB_TYPE_STORAGE=db python3 -m models.engine.indexes [--check]
+
+With --check the missing indexes are only listed, and the exit status is
+1 when there are some.
+"""
+
+import models
+import sys
+
+
+def main(argv):
+    """Lists the missing indexes, creating them unless checking"""
+    if models.storage_t != "db":
+        print("Indexes only exist with HBNB_TYPE_STORAGE=db")
+        return 2
+    check = "--check" in argv[1:]
+    missing = models.storage.missing_indexes(create=not check)
+    for name in missing:
+        print("{} {}".format("missing" if check else "created", name))
+    if not missing:
+        print("All indexes exist")
+    return 1 if check and missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
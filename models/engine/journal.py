@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+"""
+Contains the Journal class
+"""
+
+import json
+from models.engine.serializers import JSONSerializer, write
+from models.engine.shards import shard_path
+import os
+import threading
+
+
+class Journal:
+    """
+    Append-only log of the changes made on top of a FileStorage snapshot.
+
+    Each line of the log is a JSON record {"key": <class name>.id,
+    "value": <to_dict() of the object>}, with a null value when the
+    object was deleted. Once the log grows past max_size it is rotated
+    and folded into a new snapshot by a background thread, or into the
+    shards of the classes it touches when shards is the shard directory
+    of a sharded layout. Snapshots are read and written with serializer,
+    JSON by default, and folded is called once a fold is done. While
+    there is no snapshot yet, the first fold reads the entries of the
+    fallback (path, serializer) instead, the file the snapshot replaces.
+    """
+
+    def __init__(self, snapshot, max_size, shards=None, serializer=None,
+                 folded=None, fallback=None):
+        """Instantiate a Journal for the snapshot file at snapshot"""
+        self.snapshot = snapshot
+        self.shards = shards
+        self.serializer = serializer or JSONSerializer()
+        self.folded = folded
+        self.fallback = fallback
+        self.path = snapshot + ".log"
+        self.rotated = self.path + ".1"
+        self.max_size = max_size
+        self.__compactor = None
+        self.__lock = threading.Lock()
+
+    def append(self, records):
+        """
+        Appends records to the log.
+
+        Args:
+            records (list): (key, value) pairs, value being None when the
+                object was deleted.
+        """
+        lines = [json.dumps({"key": key, "value": value})
+                 for key, value in records]
+        with self.__lock:
+            with open(self.path, 'a') as f:
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
+        if size >= self.max_size:
+            self.compact()
+
+    def changes(self):
+        """
+        Returns the last record of each key in the rotated then live log.
+
+        Returns:
+            dict: The logged values by key, None for deleted objects.
+        """
+        changes = self.__read(self.rotated)
+        changes.update(self.__read(self.path))
+        return changes
+
+    def compact(self):
+        """Rotates the log and folds it into the snapshot in the background"""
+        with self.__lock:
+            if self.__compactor is not None and self.__compactor.is_alive():
+                return
+            if not os.path.exists(self.rotated):
+                os.replace(self.path, self.rotated)
+            self.__compactor = threading.Thread(target=self.__fold,
+                                                daemon=True)
+            self.__compactor.start()
+
+    def wait(self):
+        """Waits for a running compaction to finish"""
+        compactor = self.__compactor
+        if compactor is not None:
+            compactor.join()
+
+    def clear(self):
+        """Removes the log files once the snapshot holds every change"""
+        self.wait()
+        with self.__lock:
+            for path in (self.rotated, self.path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def __fold(self):
+        """Writes the snapshot with the rotated log applied to it"""
+        changes = self.__read(self.rotated)
+        if self.shards is None:
+            path, serializer = self.snapshot, self.serializer
+            if self.fallback is not None and not os.path.exists(path):
+                path, serializer = self.fallback
+            self.serializer.write(self.snapshot,
+                                  self.__folded(path, changes, serializer))
+        else:
+            os.makedirs(self.shards, exist_ok=True)
+            by_class = {}
+            for key, value in changes.items():
+                by_class.setdefault(key.split(".", 1)[0], {})[key] = value
+            for name, class_changes in by_class.items():
+                path = shard_path(self.shards, name)
+                self.serializer.write(path,
+                                      self.__folded(path, class_changes))
+        os.remove(self.rotated)
+        if self.folded is not None:
+            self.folded()
+
+    def __folded(self, path, changes, serializer=None):
+        """Yields the (key, value) entries of the file at path, read with
+        serializer or the snapshot one, with changes applied"""
+        try:
+            with open(path, 'rb') as f:
+                for key, value in (serializer or self.serializer).read(f):
+                    if key not in changes:
+                        yield key, value
+        except FileNotFoundError:
+            pass
+        for key, value in changes.items():
+            if value is not None:
+                yield key, value
+
+    @staticmethod
+    def __read(path):
+        """Returns the last record of each key in the log at path"""
+        changes = {}
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # torn write at the end of the log
+                        break
+                    changes[record["key"]] = record["value"]
+        except FileNotFoundError:
+            pass
+        return changes
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+"""
+Contains the ObjectStream class
+"""
+
+import codecs
+import json
+import re
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class ObjectStream:
+    """
+    Iterates over the members of the top-level JSON object of a file
+    without parsing the whole file at once.
+
+    The file is read in chunks of chunk_size bytes and each (key, value)
+    member is decoded as soon as it is complete, so memory use is bound
+    by the largest member rather than by the size of the file.
+    """
+
+    def __init__(self, f, chunk_size=1 << 20):
+        """Instantiate an ObjectStream reading the binary file f"""
+        self.f = f
+        self.chunk_size = chunk_size
+        # int - number of bytes read from the file so far
+        self.bytes_read = 0
+        # tuple - character offsets of the value of the last member
+        self.span = None
+        # bool - whether every byte read so far is ASCII, in which case
+        # the character offsets of span are also byte offsets
+        self.ascii = True
+        self.__decoder = json.JSONDecoder()
+        self.__text = codecs.getincrementaldecoder('utf-8')()
+        self.__buf = ""
+        self.__pos = 0
+        # int - character offset of __buf[0] in the file
+        self.__base = 0
+        self.__eof = False
+
+    def __iter__(self):
+        """Yields the (key, value) members of the object"""
+        if self.__next_char() != "{":
+            raise ValueError("expected a JSON object")
+        self.__pos += 1
+        if self.__next_char() == "}":
+            return
+        while True:
+            key = self.__decode()
+            if self.__next_char() != ":":
+                raise ValueError("expected ':' after key {}".format(key))
+            self.__pos += 1
+            self.__next_char()
+            start = self.__base + self.__pos
+            value = self.__decode()
+            self.span = (start, self.__base + self.__pos)
+            yield key, value
+            char = self.__next_char()
+            self.__pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError("expected ',' or '}' after a value")
+            self.__next_char()
+
+    def __fill(self):
+        """Reads the next chunk, returning False at the end of the file"""
+        if self.__eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        self.bytes_read += len(chunk)
+        self.ascii = self.ascii and chunk.isascii()
+        self.__eof = not chunk
+        self.__base += self.__pos
+        self.__buf = self.__buf[self.__pos:] + self.__text.decode(
+            chunk, self.__eof)
+        self.__pos = 0
+        return True
+
+    def __next_char(self):
+        """Skips whitespace and returns the next character"""
+        while True:
+            if self.__pos < len(self.__buf) and \
+                    self.__buf[self.__pos] not in " \t\n\r":
+                return self.__buf[self.__pos]
+            self.__pos = WHITESPACE.match(self.__buf, self.__pos).end()
+            if self.__pos < len(self.__buf):
+                return self.__buf[self.__pos]
+            if not self.__fill():
+                raise ValueError("unexpected end of JSON object")
+
+    def __decode(self):
+        """Decodes the JSON value at the current position"""
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buf, self.__pos)
+            except ValueError:
+                if self.__fill():
+                    continue
+                raise
+            if end == len(self.__buf) and self.__fill():
+                # a number or literal may go on in the next chunk
+                continue
+            self.__pos = end
+            return value
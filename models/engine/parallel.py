@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+"""
+Builds the objects of a JSON snapshot on a pool of processes
+"""
+
+import multiprocessing
+from models.engine.json_stream import ObjectStream
+import os
+import re
+
+# number of byte ranges the snapshot is split into per worker, so that
+# workers finishing early pick up more work
+RANGES_PER_WORKER = 4
+# int - number of bytes read at a time by the workers
+CHUNK_SIZE = 1 << 16
+# int - how far before its range a worker looks for an entry boundary, so
+# that it finds the entries whose key starts before the range but whose
+# value starts in it
+LOOKBEHIND = 1024
+
+# end of an object value followed by the key of the next entry, the only
+# place a top-level entry can start after the first one
+BOUNDARY = re.compile(rb'}\s*,\s*"')
+
+
+class Suffix:
+    """
+    Binary file reading as a JSON object the entries of f that start at
+    offset start, by reading an opening brace first.
+    """
+
+    def __init__(self, f, start):
+        """Instantiate a Suffix of f from offset start"""
+        self.f = f
+        self.f.seek(start)
+        self.prefix = b"{"
+
+    def read(self, size):
+        """Reads up to size bytes"""
+        data = self.prefix + self.f.read(size)
+        self.prefix = b""
+        return data
+
+
+def entries(f, start):
+    """
+    Returns an ObjectStream over the entries of f from the first entry
+    boundary found LOOKBEHIND bytes before offset start, with the file
+    offset of the stream start, or (None, None) when there is none.
+    """
+    if start <= LOOKBEHIND:
+        f.seek(0)
+        return ObjectStream(f, CHUNK_SIZE), 0
+    position = start - LOOKBEHIND
+    while True:
+        f.seek(position)
+        data = f.read(CHUNK_SIZE)
+        if not data:
+            return None, None
+        match = BOUNDARY.search(data)
+        if match is None:
+            # keep the last bytes, a boundary may straddle the chunks
+            position += max(len(data) - 64, 1)
+            continue
+        quote = position + match.end() - 1
+        stream = ObjectStream(Suffix(f, quote), CHUNK_SIZE)
+        try:
+            key, value = next(iter(stream))
+        except (ValueError, StopIteration):
+            key, value = None, None
+        if isinstance(value, dict) and key == "{}.{}".format(
+                value.get("__class__"), value.get("id")):
+            return ObjectStream(Suffix(f, quote), CHUNK_SIZE), quote - 1
+        position = position + match.start() + 1
+
+
+def load_range(path, start, end, classes, skip):
+    """
+    Builds the objects of the entries of the snapshot at path whose value
+    starts between the byte offsets start and end.
+
+    Returns:
+        tuple: The offset of the value of the first entry read and of the
+            first entry after end, None at the end of the file, and the
+            list of objects built. None when the file is not ASCII, so
+            character and byte offsets differ.
+    """
+    objs = []
+    first = None
+    with open(path, 'rb') as f:
+        stream, base = entries(f, start)
+        if stream is None:
+            return None, None, objs
+        for key, value in stream:
+            if not stream.ascii:
+                return None
+            offset = base + stream.span[0]
+            if offset < start:
+                continue
+            if first is None:
+                first = offset
+            if offset >= end:
+                return first, offset, objs
+            if key not in skip:
+                objs.append(classes[value["__class__"]](**value))
+    return first, None, objs
+
+
+def load(path, workers, classes, skip=()):
+    """
+    Builds the objects of the snapshot at path on workers processes.
+
+    The file is split into byte ranges and each worker parses the entries
+    of its range and builds their objects, which are sent back pickled.
+    A worker after the first finds where its first entry starts by
+    looking for the next key, and every range must start exactly where
+    the parse of the previous one stopped, so a key found inside a string
+    is detected instead of loading a bogus object.
+
+    Args:
+        path (str): Path to the JSON snapshot.
+        workers (int): Number of processes.
+        classes (dict): Classes by name.
+        skip (set, optional): Keys of the entries not to build.
+
+    Returns:
+        list: The objects in file order, or None when the file could not
+            be split, in which case it should be read sequentially.
+    """
+    try:
+        context = multiprocessing.get_context("fork")
+    except ValueError:
+        return None
+    size = os.path.getsize(path)
+    count = workers * RANGES_PER_WORKER
+    bounds = [size * i // count for i in range(count)] + [size]
+    skip = set(skip)
+    with context.Pool(workers) as pool:
+        results = pool.starmap(load_range,
+                               [(path, bounds[i], bounds[i + 1], classes,
+                                 skip) for i in range(count)])
+    objs = []
+    expected = False
+    for result in results:
+        if result is None:
+            return None
+        first, after, range_objs = result
+        if expected is not False and first != expected:
+            return None
+        expected = after
+        objs.extend(range_objs)
+    return objs
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Contains the TimedQueuePool class
+"""
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+import threading
+import time
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool that records how long checkouts wait for a connection.
+
+    The counters are kept per pool, so they start over when the engine
+    recreates its pool after a disconnect.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Instantiate a TimedQueuePool with the QueuePool arguments"""
+        super().__init__(*args, **kwargs)
+        self.__lock = threading.Lock()
+        self.__stats = {"checkouts": 0, "timeouts": 0, "wait_time": 0.0,
+                        "max_wait": 0.0}
+
+    def _do_get(self):
+        """Checks out a connection, timing the wait"""
+        start = time.monotonic()
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            with self.__lock:
+                self.__stats["timeouts"] += 1
+            raise
+        finally:
+            elapsed = time.monotonic() - start
+            with self.__lock:
+                stats = self.__stats
+                stats["checkouts"] += 1
+                stats["wait_time"] += elapsed
+                stats["max_wait"] = max(stats["max_wait"], elapsed)
+
+    def stats(self):
+        """
+        Returns the pool occupancy and checkout counters.
+
+        Returns:
+            dict: The pool size and overflow limit, the connections
+                checked out, idle in the pool and opened past its size,
+                the number of checkouts and of checkouts that timed out,
+                and the total, mean and largest checkout wait in seconds.
+        """
+        with self.__lock:
+            stats = dict(self.__stats)
+        stats["mean_wait"] = stats["wait_time"] / (stats["checkouts"] or 1)
+        stats.update({"size": self.size(), "max_overflow": self._max_overflow,
+                      "checked_out": self.checkedout(),
+                      "checked_in": self.checkedin(),
+                      "overflow": max(self.overflow(), 0),
+                      "timeout": self.timeout()})
+        return stats
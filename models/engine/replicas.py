@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+Contains the Replicas and RoutingSession classes
+"""
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+import threading
+import time
+
+
+class Replicas:
+    """
+    Round-robin over the engines of the read replicas.
+
+    A replica whose connection fails is skipped, and checked again with a
+    test query once retry seconds have passed.
+    """
+
+    def __init__(self, engines, retry=30):
+        """Instantiate Replicas over a list of engines"""
+        self.__engines = list(engines)
+        self.__retry = retry
+        self.__lock = threading.Lock()
+        self.__next = 0
+        # engine -> time.monotonic() of its last failure
+        self.__down = {}
+        for engine in self.__engines:
+            event.listen(engine, "handle_error", self.__failed)
+
+    def choose(self):
+        """
+        Returns the next healthy replica engine, or None when they are all
+        down.
+        """
+        for i in range(len(self.__engines)):
+            with self.__lock:
+                engine = self.__engines[self.__next]
+                self.__next = (self.__next + 1) % len(self.__engines)
+            if self.__healthy(engine):
+                return engine
+        return None
+
+    def __healthy(self, engine):
+        """Returns whether the engine is up, checking a failed one again"""
+        with self.__lock:
+            failed = self.__down.get(engine)
+            if failed is None:
+                return True
+            if time.monotonic() - failed < self.__retry:
+                return False
+            # checked by this caller, the others skip it meanwhile
+            self.__down[engine] = time.monotonic()
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        except Exception:
+            return False
+        with self.__lock:
+            self.__down.pop(engine, None)
+        return True
+
+    def __failed(self, context):
+        """Marks the engine of a failed connection as down"""
+        if context.is_disconnect or context.connection is None:
+            with self.__lock:
+                self.__down[context.engine] = time.monotonic()
+
+    def stats(self):
+        """
+        Returns the health and pool counters of each replica.
+
+        Returns:
+            list: For each replica, its host and database, whether it is
+                up and the counters of its connection pool.
+        """
+        with self.__lock:
+            down = set(self.__down)
+        stats = []
+        for engine in self.__engines:
+            replica = {"url": engine.url.render_as_string(hide_password=True),
+                       "healthy": engine not in down}
+            if hasattr(engine.pool, "stats"):
+                replica.update(engine.pool.stats())
+            stats.append(replica)
+        return stats
+
+
+class RoutingSession(Session):
+    """
+    Session sending its reads to a replica until it writes.
+
+    The session keeps the replica it picked first. Once it flushes or is
+    pinned with use_primary(), every query goes to the primary so that it
+    reads its own writes, until the session is closed.
+    """
+
+    def __init__(self, replicas=None, **kwargs):
+        """Instantiate a RoutingSession reading from replicas"""
+        super().__init__(**kwargs)
+        self.replicas = replicas
+        self.replica = None
+        self.primary = replicas is None
+
+    def use_primary(self):
+        """Sends every query to the primary until the session is closed"""
+        self.primary = True
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """Returns the engine of the primary or of a replica"""
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.primary = True
+        if not self.primary and getattr(clause, "is_select", False):
+            if self.replica is None:
+                self.replica = self.replicas.choose()
+            if self.replica is not None:
+                return self.replica
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    def close(self):
+        """Closes the session, reading from replicas again"""
+        super().close()
+        self.replica = None
+        self.primary = self.replicas is None
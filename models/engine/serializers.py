@@ -0,0 +1,437 @@
+#!/usr/bin/python3
+"""
+Contains the serializers FileStorage writes its snapshots with
+"""
+
+from datetime import datetime, timedelta
+import json
+from models.engine.json_stream import ObjectStream
+import os
+import struct
+
+# bytes - first bytes of a binary snapshot, the last one being the version
+MAGIC = b"HBNB\x01"
+# int - strings up to this many bytes are interned by the binary format
+INTERN_MAX = 64
+# int - number of bytes the binary format buffers before yielding a chunk
+CHUNK_SIZE = 1 << 20
+
+# record tags of the binary format
+END, SHAPE, OBJECT, OBJECT_KEYED = range(4)
+# value tags of the binary format, TIME being the zigzag varint timestamps
+# of version 1 files that are still read and TIME64 the fixed-size ones
+# written now, which decode with a single unpack_from()
+NONE, TRUE, FALSE, INT, FLOAT, STR, TIME, LIST, DICT, TIME64 = range(10)
+
+# tuple - attributes whose to_dict() strings are stored as timestamps
+TIMESTAMPS = ("created_at", "updated_at")
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+DOUBLE = struct.Struct("<d")
+INT64 = struct.Struct("<q")
+
+
+def write(path, chunks, mode='w'):
+    """
+    Writes the chunks to path atomically.
+
+    The chunks are written and synced to a temporary file next to path
+    which then replaces it, so a crash mid-write leaves the previous
+    file intact and readers never see a partially written one.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, mode) as f:
+        f.writelines(chunks)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def timestamp(s):
+    """
+    Returns the naive datetime of a string in the to_dict() timestamp
+    format, or None when it is any other string.
+    """
+    # with its separators in place and no zone, an ASCII string that
+    # fromisoformat() parses has digits everywhere else, so it is written
+    # back the same
+    if len(s) != 26 or not (s[4] == s[7] == "-" and s[10] == "T" and
+                            s[13] == s[16] == ":" and s[19] == ".") or \
+            not s.isascii():
+        return None
+    try:
+        value = datetime.fromisoformat(s)
+    except ValueError:
+        return None
+    if value.tzinfo is not None:
+        return None
+    return value
+
+
+class JSONSerializer:
+    """
+    Snapshots as a JSON object of the to_dict() of each object by key.
+    """
+
+    # string - extension of the snapshot files
+    extension = ".json"
+
+    def read(self, f):
+        """Returns an iterator over the (key, value) entries of the binary
+        file f, with the span and ascii attributes of ObjectStream"""
+        return ObjectStream(f)
+
+    def write(self, path, items):
+        """Writes the (key, value) pairs of items to path atomically"""
+        write(path, self.dump(items))
+
+    @staticmethod
+    def dump(items):
+        """Yields the chunks of the snapshot of the (key, value) pairs"""
+        yield "{"
+        separator = ""
+        for key, value in items:
+            yield separator + json.dumps(key) + ": " + json.dumps(value)
+            separator = ", "
+        yield "}"
+
+
+class BinarySerializer:
+    """
+    Snapshots in a compact binary format.
+
+    Objects are written as records of values only. The class name and
+    attribute names of each distinct set of attributes are written once
+    in a shape record that the objects refer to by number. The TIMESTAMPS
+    attributes are stored as 8-byte microseconds since the epoch and read
+    back as datetime objects. Strings up to INTERN_MAX bytes, such as ids and the
+    foreign keys that repeat them, are written once and then by number.
+    """
+
+    # string - extension of the snapshot files
+    extension = ".bin"
+
+    def read(self, f):
+        """Returns an iterator over the (key, value) entries of the binary
+        file f"""
+        return BinaryStream(f)
+
+    def write(self, path, items):
+        """Writes the (key, value) pairs of items to path atomically"""
+        write(path, self.dump(items), 'wb')
+
+    def dump(self, items):
+        """Yields the chunks of the snapshot of the (key, value) pairs"""
+        out = bytearray(MAGIC)
+        strings = {}
+        shapes = {}
+        for key, value in items:
+            name = value["__class__"]
+            # by the attribute names with __class__, skipped only once
+            shape, fields = shapes.get((name, tuple(value)), (None, None))
+            if shape is None:
+                fields = tuple(field for field in value
+                               if field != "__class__")
+                shape = len(shapes)
+                shapes[(name, tuple(value))] = shape, fields
+                out.append(SHAPE)
+                self.__string(out, strings, name)
+                self.__varint(out, len(fields))
+                for field in fields:
+                    self.__string(out, strings, field)
+            if key == name + "." + str(value.get("id")):
+                out.append(OBJECT)
+            else:
+                out.append(OBJECT_KEYED)
+                self.__string(out, strings, key)
+            if shape < 0x80:
+                out.append(shape)
+            else:
+                self.__varint(out, shape)
+            for field in fields:
+                item = value[field]
+                if type(item) is not str:
+                    self.__value(out, strings, item)
+                    continue
+                if field in TIMESTAMPS:
+                    time = timestamp(item)
+                    if time is not None:
+                        out.append(TIME64)
+                        out += INT64.pack((time - EPOCH) // MICROSECOND)
+                        continue
+                # most strings repeat an interned one of a small number
+                ref = strings.get(item)
+                if ref is not None and ref < 0x7f:
+                    out.append(STR)
+                    out.append(ref + 1)
+                elif ref is not None and ref < 0x3fff:
+                    out.append(STR)
+                    out.append((ref + 1) & 0x7f | 0x80)
+                    out.append((ref + 1) >> 7)
+                else:
+                    out.append(STR)
+                    self.__string(out, strings, item)
+            if len(out) >= CHUNK_SIZE:
+                yield bytes(out)
+                out.clear()
+        out.append(END)
+        yield bytes(out)
+
+    @staticmethod
+    def __varint(out, n):
+        """Appends the unsigned integer n in 7-bit groups"""
+        while n >= 0x80:
+            out.append(n & 0x7f | 0x80)
+            n >>= 7
+        out.append(n)
+
+    def __string(self, out, strings, s):
+        """Appends a string, by number when it was interned before"""
+        ref = strings.get(s)
+        if ref is not None:
+            self.__varint(out, ref + 1)
+            return
+        data = s.encode('utf-8')
+        out.append(0)
+        self.__varint(out, len(data))
+        out += data
+        if len(data) <= INTERN_MAX:
+            strings[s] = len(strings)
+
+    def __value(self, out, strings, value):
+        """Appends a tagged JSON value or datetime"""
+        if isinstance(value, str):
+            out.append(STR)
+            self.__string(out, strings, value)
+        elif value is None:
+            out.append(NONE)
+        elif value is True:
+            out.append(TRUE)
+        elif value is False:
+            out.append(FALSE)
+        elif isinstance(value, int):
+            out.append(INT)
+            self.__varint(out, value << 1 if value >= 0 else
+                          (-value << 1) - 1)
+        elif isinstance(value, float):
+            out.append(FLOAT)
+            out += DOUBLE.pack(value)
+        elif isinstance(value, datetime):
+            out.append(TIME64)
+            out += INT64.pack((value - EPOCH) // MICROSECOND)
+        elif isinstance(value, (list, tuple)):
+            out.append(LIST)
+            self.__varint(out, len(value))
+            for item in value:
+                self.__value(out, strings, item)
+        elif isinstance(value, dict):
+            out.append(DICT)
+            self.__varint(out, len(value))
+            for field, item in value.items():
+                self.__string(out, strings, str(field))
+                self.__value(out, strings, item)
+        else:
+            raise TypeError("cannot serialize {}".format(type(value)))
+
+
+def read_varint(buf, pos):
+    """Returns the unsigned integer at pos in buf and the position after
+    it"""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def read_string(buf, pos, strings):
+    """Returns the string at pos in buf and the position after it,
+    interning it in strings like the writer did"""
+    ref, pos = read_varint(buf, pos)
+    if ref:
+        return strings[ref - 1], pos
+    return read_text(buf, pos, strings)
+
+
+def read_text(buf, pos, strings):
+    """Returns the string written in full at pos in buf, after its 0
+    reference, and the position after it"""
+    size, pos = read_varint(buf, pos)
+    end = pos + size
+    if end > len(buf):
+        raise IndexError("string past the end of the buffer")
+    s = buf[pos:end].decode('utf-8')
+    if size <= INTERN_MAX:
+        strings.append(s)
+    return s, end
+
+
+def read_value(buf, pos, strings):
+    """Returns the tagged value at pos in buf and the position after it"""
+    tag = buf[pos]
+    pos += 1
+    if tag == STR:
+        return read_string(buf, pos, strings)
+    if tag == TIME64:
+        return EPOCH + MICROSECOND * INT64.unpack_from(buf, pos)[0], pos + 8
+    if tag == INT or tag == TIME:
+        n, pos = read_varint(buf, pos)
+        n = n >> 1 if not n & 1 else -((n + 1) >> 1)
+        return (n if tag == INT else EPOCH + n * MICROSECOND), pos
+    if tag == NONE:
+        return None, pos
+    if tag == TRUE:
+        return True, pos
+    if tag == FALSE:
+        return False, pos
+    if tag == FLOAT:
+        return DOUBLE.unpack_from(buf, pos)[0], pos + DOUBLE.size
+    if tag == LIST:
+        count, pos = read_varint(buf, pos)
+        items = []
+        for i in range(count):
+            item, pos = read_value(buf, pos, strings)
+            items.append(item)
+        return items, pos
+    if tag == DICT:
+        count, pos = read_varint(buf, pos)
+        items = {}
+        for i in range(count):
+            field, pos = read_string(buf, pos, strings)
+            items[field], pos = read_value(buf, pos, strings)
+        return items, pos
+    raise ValueError("unknown value tag {}".format(tag))
+
+
+class BinaryStream:
+    """
+    Iterates over the (key, value) entries of a binary snapshot without
+    reading the whole file at once.
+
+    Records are decoded in one loop over local variables, which pure
+    Python runs much faster than a method call per value. A record cut by
+    the end of the buffer raises IndexError or struct.error; the strings
+    it interned are then dropped and it is decoded again once the
+    next chunk is read.
+    """
+
+    def __init__(self, f, chunk_size=1 << 20):
+        """Instantiate a BinaryStream reading the binary file f"""
+        self.f = f
+        self.chunk_size = chunk_size
+        # int - number of bytes read from the file so far
+        self.bytes_read = 0
+        # entries have no JSON text to point into
+        self.span = None
+        self.ascii = False
+        self.__buf = b""
+        self.__eof = False
+
+    def __iter__(self):
+        """Yields the (key, value) entries of the snapshot"""
+        while len(self.__buf) < len(MAGIC) and self.__fill(0):
+            pass
+        if self.__buf[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a binary snapshot")
+        strings = []
+        shapes = []
+        pos = len(MAGIC)
+        while True:
+            buf = self.__buf
+            try:
+                while True:
+                    start = pos
+                    interned = len(strings)
+                    tag = buf[pos]
+                    if tag == OBJECT or tag == OBJECT_KEYED:
+                        key = None
+                        pos += 1
+                        if tag == OBJECT_KEYED:
+                            key, pos = read_string(buf, pos, strings)
+                        shape = buf[pos]
+                        if shape < 0x80:
+                            pos += 1
+                        else:
+                            shape, pos = read_varint(buf, pos)
+                        name, fields = shapes[shape]
+                        value = {}
+                        for field in fields:
+                            tag = buf[pos]
+                            if tag == STR:
+                                # most strings repeat an interned one,
+                                # references below 1 << 14 decode inline
+                                ref = buf[pos + 1]
+                                if ref < 0x80:
+                                    pos += 2
+                                elif buf[pos + 2] < 0x80:
+                                    ref = ref & 0x7f | buf[pos + 2] << 7
+                                    pos += 3
+                                else:
+                                    ref, pos = read_varint(buf, pos + 1)
+                                if ref:
+                                    value[field] = strings[ref - 1]
+                                    continue
+                                size = buf[pos]
+                                end = pos + 1 + size
+                                if size >= 0x80 or end > len(buf):
+                                    value[field], pos = read_text(buf, pos,
+                                                                  strings)
+                                    continue
+                                text = buf[pos + 1:end].decode('utf-8')
+                                if size <= INTERN_MAX:
+                                    strings.append(text)
+                                value[field] = text
+                                pos = end
+                            elif tag == TIME64:
+                                value[field] = EPOCH + MICROSECOND * \
+                                    INT64.unpack_from(buf, pos + 1)[0]
+                                pos += 9
+                            elif tag == FLOAT:
+                                value[field] = DOUBLE.unpack_from(buf,
+                                                                  pos + 1)[0]
+                                pos += 9
+                            else:
+                                value[field], pos = read_value(buf, pos,
+                                                               strings)
+                        value["__class__"] = name
+                        if key is None:
+                            key = name + "." + str(value.get("id"))
+                        yield key, value
+                    elif tag == SHAPE:
+                        name, pos = read_string(buf, pos + 1, strings)
+                        count, pos = read_varint(buf, pos)
+                        fields = []
+                        for i in range(count):
+                            field, pos = read_string(buf, pos, strings)
+                            fields.append(field)
+                        shapes.append((name, tuple(fields)))
+                    elif tag == END:
+                        return
+                    else:
+                        raise ValueError("unknown record tag {}".format(tag))
+            except (IndexError, struct.error):
+                # the record goes on in the next chunk
+                del strings[interned:]
+                if not self.__fill(start):
+                    raise ValueError("truncated binary snapshot")
+                pos = 0
+
+    def __fill(self, start):
+        """Keeps the buffer from start on and reads the next chunk into it,
+        returning False at the end of the file"""
+        if self.__eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        self.bytes_read += len(chunk)
+        self.__eof = not chunk
+        self.__buf = self.__buf[start:] + chunk
+        return not self.__eof
+
+
+# serializers by HBNB_FILE_FORMAT value
+serializers = {"json": JSONSerializer, "binary": BinarySerializer}
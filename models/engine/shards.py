@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+"""
+Helpers for the sharded FileStorage layout, which keeps the objects of
+each class in their own JSON file of a shard directory
+"""
+
+import json
+from models.engine.json_stream import ObjectStream
+import os
+
+# string - file name extension of the shards
+EXTENSION = ".json"
+
+
+def shard_path(directory, name):
+    """Returns the path of the shard of the class called name"""
+    return os.path.join(directory, name + EXTENSION)
+
+
+def shard_names(directory):
+    """Returns the names of the classes that have a shard in directory"""
+    try:
+        files = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return sorted(f[:-len(EXTENSION)] for f in files if f.endswith(EXTENSION))
+
+
+def migrate(path, directory):
+    """
+    Splits the single-file snapshot at path into one shard per class.
+
+    The snapshot is streamed so it is never held in memory as a whole.
+    Every shard is written to a temporary file first and the directory
+    only appears once all of them are complete. The snapshot is then
+    renamed to <path>.migrated.
+    """
+    tmp = directory + ".tmp"
+    os.makedirs(tmp, exist_ok=True)
+    for name in shard_names(tmp):
+        os.remove(shard_path(tmp, name))
+    shards = {}
+    try:
+        with open(path, 'rb') as f:
+            for key, value in ObjectStream(f):
+                name = key.split(".", 1)[0]
+                if name not in shards:
+                    shards[name] = open(shard_path(tmp, name), 'w')
+                    shards[name].write("{")
+                else:
+                    shards[name].write(", ")
+                shards[name].write(json.dumps(key) + ": " + json.dumps(value))
+        for shard in shards.values():
+            shard.write("}")
+            shard.flush()
+            os.fsync(shard.fileno())
+    finally:
+        for shard in shards.values():
+            shard.close()
+    os.replace(tmp, directory)
+    os.replace(path, path + ".migrated")
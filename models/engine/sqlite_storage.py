@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+"""
+
+from models.engine.db_storage import DBStorage
+from os import getenv
+from sqlalchemy import create_engine, event
+
+# pragmas set on every new connection: write-ahead logging so that reads
+# do not block the writer, with fewer fsyncs, and foreign keys enforced as
+# MySQL does
+PRAGMAS = ("journal_mode=WAL", "synchronous=NORMAL", "foreign_keys=ON")
+# int - number of prepared statements kept by each connection
+CACHED_STATEMENTS = 256
+
+
+def set_pragmas(connection, record):
+    """Sets the PRAGMAS of a new SQLite connection"""
+    cursor = connection.cursor()
+    for pragma in PRAGMAS:
+        cursor.execute("PRAGMA " + pragma)
+    cursor.close()
+
+
+class SQLiteStorage(DBStorage):
+    """
+    Interacts with a SQLite database file.
+
+    Used with HBNB_TYPE_STORAGE=sqlite, it stores the same models as
+    DBStorage in the file HBNB_SQLITE_PATH (default hbnb.db), without a
+    database server.
+    """
+
+    def engine(self):
+        """Returns the engine of the SQLite database file"""
+        engine = create_engine('sqlite:///{}'.
+                               format(getenv('HBNB_SQLITE_PATH', 'hbnb.db')),
+                               connect_args={
+                                   "check_same_thread": False,
+                                   "cached_statements": CACHED_STATEMENTS},
+                               **self.pool_options())
+        event.listen(engine, "connect", set_pragmas)
+        return engine
@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+"""
+Contains the Serializer class
+"""
+
+from functools import partial
+from json import dumps
+from json.encoder import encode_basestring_ascii
+from models import timestamps
+
+# tuple - attributes to_dict() writes as timestamp strings
+TIMESTAMPS = ("created_at", "updated_at")
+# int - number of attribute layouts a Serializer generates encoders for,
+# objects of other layouts are encoded by the generic code
+MAX_LAYOUTS = 64
+
+# dictionary - json.dumps() options of the compact JSON text, the one
+# jsonify() writes outside debug mode
+COMPACT = {"sort_keys": True, "separators": (",", ":")}
+
+# dictionary - Serializer by class
+serializers = {}
+
+
+def get_serializer(cls):
+    """Returns the Serializer of a class, created on the first call"""
+    serializer = serializers.get(cls)
+    if serializer is None:
+        serializer = serializers.setdefault(cls, Serializer(cls))
+    return serializer
+
+
+class Serializer:
+    """
+    Encodes the objects of a class as the dictionary of to_dict(), or as
+    its JSON text, optionally keeping only some of its keys.
+
+    to_dict() follows the order of the instance __dict__, which depends
+    on how each object was built, so the encoders are generated for each
+    layout of __dict__ met, the attribute names in order, and then reused
+    for every object of that layout. The output is the same byte for byte
+    as json.dumps() of the to_dict() dictionary, or, for the compact JSON
+    text, as json.dumps() with the COMPACT options.
+    """
+
+    def __init__(self, cls):
+        """Instantiate the Serializer of a class"""
+        self.name = cls.__name__
+        # dictionary - generated encoders by (layout, fields, json,
+        # compact)
+        self.__encoders = {}
+
+    def to_dict(self, obj, fields=None):
+        """
+        Returns the dictionary of to_dict() of obj.
+
+        Args:
+            obj: The object to encode.
+            fields (tuple, optional): The keys to keep, in any order, the
+                others are left out and their values not encoded.
+        """
+        d = obj.__dict__
+        if fields is None:
+            return self.__to_dict(d)
+        return self.__encoder(d, tuple(fields), False, False)(d)
+
+    def __to_dict(self, d):
+        """Returns the to_dict() dictionary of the __dict__ d"""
+        new_dict = d.copy()
+        for attr in TIMESTAMPS:
+            if attr in new_dict:
+                new_dict[attr] = timestamps.encode(new_dict[attr])
+        new_dict["__class__"] = self.name
+        if "_sa_instance_state" in new_dict:
+            del new_dict["_sa_instance_state"]
+        return new_dict
+
+    def to_json(self, obj, fields=None, compact=False):
+        """
+        Returns the JSON text of the dictionary of to_dict() of obj, as
+        json.dumps() writes it.
+
+        Args:
+            obj: The object to encode.
+            fields (tuple, optional): The keys to keep, as for to_dict().
+            compact (bool, optional): Whether to sort the keys and leave
+                out the spaces, as json.dumps() with the COMPACT options.
+        """
+        d = obj.__dict__
+        if fields is not None:
+            fields = tuple(fields)
+        return self.__encoder(d, fields, True, compact)(d)
+
+    def __encoder(self, d, fields, json, compact):
+        """Returns the encoder of the layout of d"""
+        key = (tuple(d), fields, json, compact)
+        encoder = self.__encoders.get(key)
+        if encoder is None:
+            if len(self.__encoders) >= MAX_LAYOUTS:
+                return self.__generic(fields, json, compact)
+            encoder = self.__encoders.setdefault(key, self.__generate(*key))
+        return encoder
+
+    def __generic(self, fields, json, compact):
+        """Returns an encoder of any layout"""
+        def encode(d):
+            """Encodes d with the generic code"""
+            new_dict = self.__to_dict(d)
+            if fields is not None:
+                new_dict = {name: value for name, value in new_dict.items()
+                            if name in fields}
+            if not json:
+                return new_dict
+            return dumps(new_dict, **COMPACT) if compact else dumps(new_dict)
+        return encode
+
+    def __generate(self, layout, fields, json, compact):
+        """Returns a function encoding the dictionaries of a layout"""
+        names = [name for name in layout + ("__class__",)
+                 if name != "_sa_instance_state" and
+                 (fields is None or name in fields)]
+        if compact:
+            names.sort()
+        separator, colon = (",", ":") if compact else (", ", ": ")
+        lines = ["def encode(d):"]
+        items = []
+        for i, name in enumerate(names):
+            if name == "__class__":
+                value = repr(dumps(self.name) if json else self.name)
+            elif name in TIMESTAMPS:
+                value = "timestamp(d[{!r}])".format(name)
+                if json:
+                    value = "'\"' + {} + '\"'".format(value)
+            elif json:
+                lines.append("    v = d[{!r}]".format(name))
+                lines.append("    v{} = string(v) if type(v) is str else "
+                             "str(v) if type(v) is int else "
+                             "'null' if v is None else dumps(v)".format(i))
+                value = "v{}".format(i)
+            else:
+                value = "d[{!r}]".format(name)
+            items.append((name, value))
+        if json:
+            lines.append("    return ''.join(({},))".format(", ".join(
+                "{!r}, {}".format(("{" if i == 0 else separator) +
+                                  dumps(name) + colon, value)
+                for i, (name, value) in enumerate(items)) +
+                (", '}'" if items else "'{}'")))
+        else:
+            lines.append("    return {{{}}}".format(", ".join(
+                "{!r}: {}".format(name, value) for name, value in items)))
+        namespace = {"dumps": partial(dumps, **COMPACT) if compact
+                     else dumps, "string": encode_basestring_ascii,
+                     "timestamp": timestamps.encode}
+        exec("\n".join(lines), namespace)
+        return namespace["encode"]
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""
+Contains the codec of the created_at and updated_at strings of to_dict()
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from os import getenv
+
+# string - format of the timestamps of to_dict()
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+# int - number of encoded datetimes cached, an object keeps its timestamps
+# while it is serialized again and again; 0 disables the cache
+CACHE_SIZE = int(getenv('HBNB_TIMESTAMP_CACHE', 4096))
+
+
+def decode(s):
+    """
+    Returns the datetime of a timestamp in TIME_FORMAT.
+
+    Strings of the exact shape to_dict() writes are parsed by
+    datetime.fromisoformat(), the others by datetime.strptime(), which
+    raises the same ValueError as before on invalid ones.
+    """
+    if len(s) == 26 and s[4] == s[7] == "-" and s[10] == "T" and \
+            s[13] == s[16] == ":" and s[19] == ".":
+        try:
+            value = datetime.fromisoformat(s)
+        except ValueError:
+            value = None
+        if value is not None and value.tzinfo is None:
+            return value
+    return datetime.strptime(s, TIME_FORMAT)
+
+
+def encode(value):
+    """Returns the timestamp of a datetime in TIME_FORMAT"""
+    if value.tzinfo is None and value.year >= 1000:
+        return isoformat(value)
+    return value.strftime(TIME_FORMAT)
+
+
+def isoformat(value):
+    """Returns the timestamp of a naive datetime from the year 1000 on"""
+    if value.microsecond:
+        return value.isoformat()
+    return value.isoformat() + ".000000"
+
+
+if CACHE_SIZE:
+    # only naive datetimes are cached: aware ones of the same instant in
+    # other zones are equal keys but have other timestamps
+    isoformat = lru_cache(maxsize=CACHE_SIZE)(isoformat)
@@ -13,7 +13,7 @@ class User(BaseModel, Base):
     """Representation of a user """
     if models.storage_t == 'db':
         __tablename__ = 'users'
-        email = Column(String(128), nullable=False)
+        email = Column(String(128), nullable=False, index=True)
         password = Column(String(128), nullable=False)
         first_name = Column(String(128), nullable=True)
         last_name = Column(String(128), nullable=True)
@@ -26,10 +26,27 @@ class User(BaseModel, Base):
         last_name = ""
 
     def __init__(self, *args, **kwargs):
-        """Initialize a new User object"""
+        """Initialize a new User object, hashing a plaintext password. A
+        stored record, which to_dict() writes with its __class__, already
+        holds the hashed password and is kept as is."""
         super().__init__(*args, **kwargs)
-        if 'password' in kwargs:
-            self.password = hashlib.md5(kwargs['password'].encode()).hexdigest()
+        if 'password' in kwargs and '__class__' not in kwargs:
+            self.update_password(kwargs['password'])
+
+    if models.storage_t != 'db':
+        @property
+        def places(self):
+            """getter for list of place instances owned by the user"""
+            from models.place import Place
+            return list(models.storage.all_by(Place, "user_id",
+                                              self.id).values())
+
+        @property
+        def reviews(self):
+            """getter for list of review instances written by the user"""
+            from models.review import Review
+            return list(models.storage.all_by(Review, "user_id",
+                                              self.id).values())
 
     def update_password(self, password):
         """Update the user's password and hash it"""
@@ -158,3 +158,22 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    @mock.patch('models.storage')
+    def test_changed(self, mock_storage):
+        """Test that only the attributes given a new value are changed,
+        outside of __dict__"""
+        inst = BaseModel(name="Holberton", number=89)
+        inst.clear_changes()
+        self.assertEqual(inst.changed(), set())
+        inst.name = "Holberton"
+        inst.number = 89.0
+        inst.my_list = []
+        self.assertEqual(inst.changed(), {"number", "my_list"})
+        del inst.name
+        self.assertEqual(inst.changed(), {"name", "number", "my_list"})
+        self.assertNotIn("_BaseModel__changes", inst.__dict__)
+        self.assertNotIn("_BaseModel__changes", inst.to_dict())
+        inst.clear_changes()
+        self.assertEqual(inst.changed(), set())
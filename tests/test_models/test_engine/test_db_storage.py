@@ -87,6 +87,32 @@ class TestDBStorage(unittest.TestCase):
         retrieved_user = self.storage.get(User, user.id)
         self.assertEqual(user, retrieved_user)
 
+    def test_get_saved(self):
+        """
+        Test that get finds saved objects by primary key, in the session
+        or in the database.
+        """
+        state = State(name="Ohio")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertIs(self.storage.get(State, state.id), state)
+        self.storage.close()
+        self.assertEqual(self.storage.get("State", state.id).id, state.id)
+        self.assertIsNone(self.storage.get(State, "missing"))
+
+    def test_get_many(self):
+        """
+        Test that get_many returns the objects in order, None if missing.
+        """
+        states = [State(name="Ohio") for i in range(2)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.save()
+        found = self.storage.get_many(State, [states[1].id, "missing",
+                                              states[0].id])
+        self.assertEqual([s and s.id for s in found],
+                         [states[1].id, None, states[0].id])
+
     def test_count(self):
         """
         Test the count method.
@@ -96,5 +122,77 @@ class TestDBStorage(unittest.TestCase):
         user_count = self.storage.count(User)
         self.assertEqual(user_count, 1)
 
+    def test_load(self):
+        """
+        Test that relationships are loaded with the objects.
+        """
+        state = State(name="Utah")
+        self.storage.new(state)
+        self.storage.save()
+        loaded = self.storage.get(State, state.id, load=["cities.places"])
+        self.assertIn("cities", loaded.__dict__)
+        states = self.storage.all(State, load=["cities"])
+        self.assertIn("cities", states["State." + state.id].__dict__)
+        self.storage.prefetch([state], "cities")
+        self.assertEqual(state.cities, [])
+
+    def test_page(self):
+        """
+        Test keyset pages in id order.
+        """
+        states = [State(name="State") for i in range(3)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.save()
+        ids = sorted(state.id for state in states)
+        page = self.storage.page(State, None, 2, {"name": "State"})
+        self.assertEqual([state.id for state in page], ids[:2])
+        page = self.storage.page(State, ids[1], 2, {"name": ["State"]})
+        self.assertEqual([state.id for state in page], ids[2:])
+
+    def test_count_all(self):
+        """
+        Test that count_all matches count for every class.
+        """
+        self.storage.new(State(name="Ohio"))
+        counts = self.storage.count_all()
+        self.assertEqual(counts["State"], self.storage.count(State))
+        self.assertEqual(counts["User"], self.storage.count(User))
+        self.assertEqual(sum(counts.values()), self.storage.count())
+
+    def test_iter(self):
+        """
+        Test that iter streams every object of a class in batches.
+        """
+        states = [State(name="State") for i in range(5)]
+        for state in states:
+            self.storage.new(state)
+        self.storage.save()
+        ids = [state.id for state in self.storage.iter(State, batch_size=2)]
+        expected = [s.id for s in self.storage.all(State).values()]
+        self.assertEqual(sorted(ids), sorted(expected))
+
+    def test_bulk_upsert(self):
+        """
+        Test that bulk_upsert inserts new rows and updates existing ones.
+        """
+        state = State(name="Utah")
+        self.assertEqual(self.storage.bulk_new([state]), 1)
+        record = state.to_dict()
+        record["name"] = "Nevada"
+        new = State(name="Idaho").to_dict()
+        count = self.storage.count(State)
+        self.assertEqual(self.storage.bulk_upsert(State, [record, new]), 2)
+        self.assertEqual(self.storage.count(State), count + 1)
+        names = {s.id: s.name for s in self.storage.iter(State)}
+        self.assertEqual(names[state.id], "Nevada")
+        self.assertEqual(names[new["id"]], "Idaho")
+
+    def test_missing_indexes(self):
+        """
+        Test that the tables have the indexes declared by the models.
+        """
+        self.assertEqual(self.storage.missing_indexes(), [])
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,13 +3,20 @@
 Unit tests for the FileStorage class.
 """
 
+import models
 import unittest
 import os
+import hashlib
 import json
+import shutil
+from datetime import datetime
+from unittest import mock
 from models.engine.file_storage import FileStorage
 from models.base_model import BaseModel
 from models.user import User
 from models.state import State
+from models.city import City
+from models.review import Review
 
 class TestFileStorage(unittest.TestCase):
     """
@@ -39,6 +46,42 @@ class TestFileStorage(unittest.TestCase):
         all_objs = self.storage.all()
         self.assertTrue(isinstance(all_objs, dict))
 
+    def test_all_cls(self):
+        """
+        Test that all(cls) only returns objects of that class.
+        """
+        state = State(name="California")
+        self.storage.new(state)
+        key = "State." + state.id
+        self.assertIn(key, self.storage.all(State))
+        self.assertIn(key, self.storage.all("State"))
+        self.assertNotIn(key, self.storage.all(User))
+        self.storage.all(State).pop(key)
+        self.assertIn(key, self.storage.all())
+        self.storage.delete(state)
+        self.assertNotIn(key, self.storage.all(State))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_all_by(self):
+        """
+        Test that the foreign key index follows new, updates and delete.
+        """
+        state = State(name="Oregon")
+        other = State(name="Texas")
+        city = City(name="Portland", state_id=state.id)
+        for obj in (state, other, city):
+            self.storage.new(obj)
+        key = "City." + city.id
+        self.assertIn(key, self.storage.all_by(City, "state_id", state.id))
+        self.assertIn(key, self.storage.all_by(City, "name", "Portland"))
+        city.state_id = other.id
+        self.assertEqual(self.storage.all_by(City, "state_id", state.id), {})
+        self.assertIn(key, self.storage.all_by(City, "state_id", other.id))
+        self.storage.delete(city)
+        self.assertEqual(self.storage.all_by(City, "state_id", other.id), {})
+        self.storage.delete(state)
+        self.storage.delete(other)
+
     def test_new(self):
         """
         Test the new method.
@@ -61,6 +104,34 @@ class TestFileStorage(unittest.TestCase):
             data = json.load(file)
             self.assertIsNotNone(data.get(key))
 
+    def test_save_changed_only(self):
+        """
+        Test that save only serializes the objects changed since the last
+        save and writes the others from their cached form.
+        """
+        first = State(name="Idaho")
+        second = State(name="Maine")
+        self.storage.new(first)
+        self.storage.new(second)
+        self.storage.save()
+        second.name = "Ohio"
+        self.storage.new(second)
+        with mock.patch.object(State, "to_json",
+                               side_effect=State.to_json,
+                               autospec=True) as to_json:
+            self.storage.save()
+        self.assertEqual(to_json.call_count, 1)
+        with open('file.json', 'r') as file:
+            data = json.load(file)
+        self.assertEqual(data["State." + first.id]["name"], "Idaho")
+        self.assertEqual(data["State." + second.id]["name"], "Ohio")
+        self.assertFalse(os.path.exists('file.json.tmp'))
+        self.storage.delete(first)
+        self.storage.delete(second)
+        self.storage.save()
+        with open('file.json', 'r') as file:
+            self.assertNotIn("State." + first.id, json.load(file))
+
     def test_reload(self):
         """
         Test the reload method.
@@ -72,6 +143,30 @@ class TestFileStorage(unittest.TestCase):
         key = "User." + user.id
         self.assertIsNotNone(self.storage.all().get(key))
 
+    def test_reload_progress(self):
+        """
+        Test that reload reports its progress and load statistics.
+        """
+        state = State(name="Iowa")
+        self.storage.new(state)
+        self.storage.save()
+        os.utime('file.json', ns=(0, 0))
+        calls = []
+        self.storage.reload(lambda *args: calls.append(args))
+        stats = self.storage.load_stats()
+        self.assertEqual(calls[-1][0], stats["objects"])
+        self.assertEqual(calls[-1][1], os.path.getsize('file.json'))
+        self.assertEqual(stats["bytes"], os.path.getsize('file.json'))
+        self.assertEqual(stats["objects"], self.storage.count())
+        self.assertIsNot(self.storage.get(State, state.id), state)
+        # the files loaded are shared with the other instances
+        count = len(calls)
+        other = FileStorage()
+        other.reload(lambda *args: calls.append(args))
+        self.assertEqual(len(calls), count)
+        self.assertEqual(other.load_stats(), stats)
+        self.storage.delete(self.storage.get(State, state.id))
+
     def test_delete(self):
         """
         Test the delete method.
@@ -92,6 +187,30 @@ class TestFileStorage(unittest.TestCase):
         retrieved_user = self.storage.get(User, user.id)
         self.assertEqual(user, retrieved_user)
 
+    def test_get_wrong_class(self):
+        """
+        Test that get only finds objects of the requested class.
+        """
+        state = State(name="Nevada")
+        self.storage.new(state)
+        self.assertIs(self.storage.get("State", state.id), state)
+        self.assertIsNone(self.storage.get(User, state.id))
+        self.storage.delete(state)
+        self.assertIsNone(self.storage.get(State, state.id))
+
+    def test_get_many(self):
+        """
+        Test that get_many returns the objects in order, None if missing.
+        """
+        states = [State(name="Ohio") for i in range(2)]
+        for state in states:
+            self.storage.new(state)
+        self.assertEqual(self.storage.get_many(State, [states[1].id, "x",
+                                                       states[0].id]),
+                         [states[1], None, states[0]])
+        for state in states:
+            self.storage.delete(state)
+
     def test_count(self):
         """
         Test the count method.
@@ -101,5 +220,384 @@ class TestFileStorage(unittest.TestCase):
         user_count = self.storage.count(User)
         self.assertEqual(user_count, 1)
 
+    def test_load(self):
+        """
+        Test that loading options are accepted and change nothing.
+        """
+        state = State(name="Utah")
+        self.storage.new(state)
+        self.assertEqual(self.storage.all(State, load=["cities"]),
+                         self.storage.all(State))
+        self.assertIs(self.storage.get(State, state.id, load=["cities"]),
+                      state)
+        self.storage.prefetch([state], "cities.places")
+        self.storage.delete(state)
+
+    def test_page(self):
+        """
+        Test keyset pages in id order, with and without filters.
+        """
+        state = State(name="Maine")
+        self.storage.new(state)
+        cities = [City(name="Town", state_id=state.id) for i in range(5)]
+        for city in cities:
+            self.storage.new(city)
+        ids = sorted(city.id for city in cities)
+        filters = {"state_id": state.id}
+        first = self.storage.page(City, None, 3, filters)
+        self.assertEqual([city.id for city in first], ids[:3])
+        rest = self.storage.page(City, ids[2], 3, filters)
+        self.assertEqual([city.id for city in rest], ids[3:])
+        self.storage.delete(cities[0])
+        ids.remove(cities[0].id)
+        city = City(name="Village", state_id=state.id)
+        self.storage.new(city)
+        ids = sorted(ids + [city.id])
+        page = self.storage.page(City, None, 10,
+                                 {"name": ["Town", "Village"]})
+        self.assertEqual([c.id for c in page if c.id in ids], ids)
+        self.assertEqual(self.storage.page(City, None, 10,
+                                           {"state_id": [state.id, "x"],
+                                            "name": "Village"}), [city])
+        for city in self.storage.all_by(City, "state_id", state.id).values():
+            self.storage.delete(city)
+        self.storage.delete(state)
+
+    def test_count_all(self):
+        """
+        Test that count_all matches count for every class.
+        """
+        self.storage.new(State(name="Ohio"))
+        counts = self.storage.count_all()
+        self.assertEqual(counts["State"], self.storage.count(State))
+        self.assertEqual(counts["User"], self.storage.count(User))
+        self.assertEqual(sum(counts.values()), self.storage.count())
+
+    def test_iter(self):
+        """
+        Test that iter yields the objects of all, even when they change.
+        """
+        states = [State(name="Iowa") for i in range(3)]
+        for state in states:
+            self.storage.new(state)
+        seen = []
+        for state in self.storage.iter(State, batch_size=2):
+            seen.append(state)
+            if state is states[0]:
+                self.storage.delete(states[1])
+        expected = set(self.storage.all(State).values())
+        self.assertEqual(set(seen) - {states[1]}, expected)
+        self.assertEqual(len(list(self.storage.iter())), self.storage.count())
+        for state in states:
+            self.storage.delete(state)
+
+    def test_bulk_new(self):
+        """
+        Test that bulk_new adds the objects and saves them once.
+        """
+        states = [State(name="Utah") for i in range(3)]
+        with mock.patch.object(self.storage, "save") as save:
+            self.assertEqual(self.storage.bulk_new(states), 3)
+        save.assert_called_once_with()
+        for state in states:
+            self.assertIs(self.storage.get(State, state.id), state)
+            self.storage.delete(state)
+
+    def test_bulk_upsert(self):
+        """
+        Test that bulk_upsert updates existing objects and adds new ones.
+        """
+        state = State(name="Utah")
+        self.storage.new(state)
+        created_at = state.created_at
+        old = state.to_dict()
+        old["name"] = "Nevada"
+        old["created_at"] = "2000-01-01T00:00:00.000000"
+        new = State(name="Idaho").to_dict()
+        self.assertEqual(self.storage.bulk_upsert(State, [old, new]), 2)
+        self.assertIs(self.storage.get(State, state.id), state)
+        self.assertEqual(state.name, "Nevada")
+        self.assertEqual(state.created_at, created_at)
+        added = self.storage.get(State, new["id"])
+        self.assertEqual(added.to_dict(), new)
+        self.storage.delete(state)
+        self.storage.delete(added)
+
+    def test_compact(self):
+        """
+        Test that compact objects share their equal values unchanged.
+        """
+        os.environ['HBNB_FILE_COMPACT'] = "1"
+        storage = FileStorage()
+        del os.environ['HBNB_FILE_COMPACT']
+        place_id = "-".join(["place", "1"])
+        reviews = [Review(text="Good", place_id="-".join(["place", "1"]),
+                          user_id="u") for i in range(2)]
+        reviews[0].updated_at = datetime.strptime(
+            reviews[0].created_at.isoformat(), "%Y-%m-%dT%H:%M:%S.%f")
+        before = [review.to_dict() for review in reviews]
+        for review in reviews:
+            storage.new(review)
+        self.assertIsNot(reviews[0].place_id, place_id)
+        self.assertIs(reviews[0].place_id, reviews[1].place_id)
+        self.assertIs(reviews[0].updated_at, reviews[0].created_at)
+        self.assertEqual([review.to_dict() for review in reviews], before)
+        self.assertEqual(len(storage.all_by(Review, "place_id", place_id)),
+                         2)
+        for review in reviews:
+            storage.delete(review)
+
+    def test_password_round_trip(self):
+        """
+        Test that a password is hashed once and kept through saves and
+        reloads.
+        """
+        hashed = hashlib.md5("testpassword".encode()).hexdigest()
+        user = User(email="test@example.com", password="testpassword")
+        self.assertEqual(user.password, hashed)
+        key = "User." + user.id
+        self.storage.new(user)
+        self.storage.save()
+        for i in range(2):
+            storage = FileStorage()
+            os.utime('file.json', ns=(i, i))
+            storage.reload()
+            loaded = storage.get(User, user.id)
+            self.assertIsNot(loaded, user)
+            self.assertEqual(loaded.password, hashed)
+            storage.new(loaded)
+            storage.save()
+            with open('file.json', 'r') as file:
+                self.assertEqual(json.load(file)[key]["password"], hashed)
+            user = loaded
+        self.storage.delete(user)
+        self.storage.save()
+
+    def test_failed_load(self):
+        """
+        Test that a snapshot not fully loaded is not overwritten.
+        """
+        environ = {'HBNB_FILE_JOURNAL': "0", 'HBNB_FILE_LAYOUT': "",
+                   'HBNB_FILE_FORMAT': "json"}
+        with mock.patch.dict(os.environ, environ):
+            FileStorage().save()
+        with open('file.json', 'r') as file:
+            data = json.load(file)
+        data["Ghost.1"] = {"__class__": "Ghost", "id": "1"}
+        with open('file.json', 'w') as file:
+            json.dump(data, file)
+        with mock.patch.dict(os.environ, environ):
+            storage = FileStorage()
+        with self.assertLogs('models.engine.file_storage', 'ERROR'):
+            storage.reload()
+        state = State(name="Utah")
+        storage.new(state)
+        with self.assertRaises(RuntimeError):
+            storage.save()
+        with mock.patch.dict(os.environ, environ):
+            other = FileStorage()
+        with self.assertRaises(RuntimeError):
+            other.save()
+        with open('file.json', 'r') as file:
+            self.assertIn("Ghost.1", json.load(file))
+        del data["Ghost.1"]
+        with open('file.json', 'w') as file:
+            json.dump(data, file)
+        storage.reload()
+        storage.save()
+        with open('file.json', 'r') as file:
+            self.assertIn("State." + state.id, json.load(file))
+        storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_changes(self):
+        """
+        Test that saved and loaded objects start with no change recorded.
+        """
+        state = State(name="Utah")
+        self.storage.new(state)
+        self.assertIn("name", state.changed())
+        self.storage.save()
+        self.assertEqual(state.changed(), set())
+        state.name = "Utah"
+        self.assertEqual(state.changed(), set())
+        state.name = "Ohio"
+        self.assertEqual(state.changed(), {"name"})
+        storage = FileStorage()
+        with mock.patch.object(FileStorage, "_FileStorage__loaded", None):
+            storage.reload()
+        self.assertEqual(storage.get(State, state.id).changed(), set())
+        self.storage.delete(state)
+        self.storage.save()
+
+
+class TestFileStorageLazy(unittest.TestCase):
+    """
+    Test cases for FileStorage in lazy mode.
+    """
+
+    def setUp(self):
+        """
+        Write a Review to the JSON file and reload it lazily.
+        """
+        os.environ['HBNB_FILE_LAZY'] = "1"
+        self.storage = FileStorage()
+        del os.environ['HBNB_FILE_LAZY']
+        for review in self.storage.all(Review).values():
+            self.storage.delete(review)
+        self.storage.save()
+        self.review = Review(text="Great stay", place_id="p", user_id="u")
+        with open('file.json', 'r') as file:
+            data = json.load(file)
+        data["Review." + self.review.id] = self.review.to_dict()
+        with open('file.json', 'w') as file:
+            json.dump(data, file)
+        self.storage.reload()
+
+    def tearDown(self):
+        """
+        Remove the Review and the JSON file.
+        """
+        review = self.storage.get(Review, self.review.id)
+        if review:
+            self.storage.delete(review)
+        if os.path.exists('file.json'):
+            os.remove('file.json')
+
+    def test_pending(self):
+        """
+        Test that entries of classes not in memory are built on demand.
+        """
+        self.assertEqual(self.storage.load_stats()["pending"], 1)
+        self.assertEqual(self.storage.count(Review), 1)
+        review = self.storage.get(Review, self.review.id)
+        self.assertEqual(review.text, "Great stay")
+        self.assertIsNot(review, self.review)
+        self.assertEqual(list(self.storage.all(Review).values()), [review])
+
+    def test_iter_pending(self):
+        """
+        Test that iterating builds pending entries without keeping them.
+        """
+        reviews = list(self.storage.iter(Review))
+        self.assertEqual([review.id for review in reviews], [self.review.id])
+        self.assertEqual(self.storage.load_stats()["pending"], 1)
+
+    def test_save_keeps_pending(self):
+        """
+        Test that saving writes the entries that were not built yet.
+        """
+        state = State(name="Vermont")
+        self.storage.new(state)
+        self.storage.save()
+        with open('file.json', 'r') as file:
+            data = json.load(file)
+        self.assertEqual(data["Review." + self.review.id]["text"],
+                         "Great stay")
+        review = self.storage.get(Review, self.review.id)
+        self.assertEqual(review.text, "Great stay")
+        self.storage.delete(state)
+
+
+class TestFileStorageSharded(unittest.TestCase):
+    """
+    Test cases for FileStorage with one file per class.
+    """
+
+    def setUp(self):
+        """
+        Write a Review to the JSON file and reload it in shards.
+        """
+        os.environ['HBNB_FILE_LAYOUT'] = "sharded"
+        self.storage = FileStorage()
+        del os.environ['HBNB_FILE_LAYOUT']
+        self.review = Review(text="Great stay", place_id="p", user_id="u")
+        with open('file.json', 'w') as file:
+            json.dump({"Review." + self.review.id: self.review.to_dict()},
+                      file)
+        self.storage.reload()
+
+    def tearDown(self):
+        """
+        Remove the Review and the shards.
+        """
+        review = self.storage.get(Review, self.review.id)
+        if review:
+            self.storage.delete(review)
+        shutil.rmtree('file.json.d', ignore_errors=True)
+        for path in ('file.json', 'file.json.migrated'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_migrate(self):
+        """
+        Test that a single-file snapshot is split into shards.
+        """
+        self.assertFalse(os.path.exists('file.json'))
+        self.assertTrue(os.path.exists('file.json.migrated'))
+        with open(os.path.join('file.json.d', 'Review.json'), 'r') as file:
+            data = json.load(file)
+        self.assertEqual(data["Review." + self.review.id]["text"],
+                         "Great stay")
+        review = self.storage.get(Review, self.review.id)
+        self.assertEqual(review.text, "Great stay")
+
+    def test_save_changed_shards(self):
+        """
+        Test that saving only rewrites the shards of changed classes.
+        """
+        self.storage.save()
+        path = os.path.join('file.json.d', 'Review.json')
+        mtime = os.stat(path).st_mtime_ns
+        state = State(name="Vermont")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+        with open(os.path.join('file.json.d', 'State.json'), 'r') as file:
+            data = json.load(file)
+        self.assertEqual(data["State." + state.id]["name"], "Vermont")
+        self.storage.delete(state)
+
+
+class TestFileStorageBinary(unittest.TestCase):
+    """
+    Test cases for FileStorage with the binary snapshot format.
+    """
+
+    def setUp(self):
+        """
+        Create a FileStorage writing binary snapshots.
+        """
+        os.environ['HBNB_FILE_FORMAT'] = "binary"
+        self.storage = FileStorage()
+        del os.environ['HBNB_FILE_FORMAT']
+
+    def tearDown(self):
+        """
+        Remove the binary snapshot.
+        """
+        if os.path.exists('file.bin'):
+            os.remove('file.bin')
+
+    def test_save_reload(self):
+        """
+        Test that objects survive a binary save and reload.
+        """
+        state = State(name="Iowa")
+        self.storage.new(state)
+        self.storage.save()
+        with open('file.bin', 'rb') as file:
+            self.assertEqual(file.read(4), b"HBNB")
+        os.utime('file.bin', ns=(0, 0))
+        self.storage.reload()
+        reloaded = self.storage.get(State, state.id)
+        self.assertIsNot(reloaded, state)
+        self.assertEqual(reloaded.to_dict(), state.to_dict())
+        self.assertEqual(self.storage.load_stats()["bytes"],
+                         os.path.getsize('file.bin'))
+        self.storage.delete(reloaded)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+"""
+Unit tests for the GroupCommit class.
+"""
+
+import threading
+import unittest
+from models.engine.group_commit import GroupCommit
+
+
+class TestGroupCommit(unittest.TestCase):
+    """
+    Test cases for the GroupCommit class.
+    """
+
+    def test_coalesce(self):
+        """
+        Test that concurrent commits share flushes.
+        """
+        flushes = []
+        group = GroupCommit(lambda: flushes.append(1), 0.05, 8)
+        threads = [threading.Thread(target=group.commit) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = group.stats()
+        self.assertEqual(stats["saves"], 8)
+        self.assertEqual(stats["flushes"], len(flushes))
+        self.assertLess(len(flushes), 8)
+        self.assertLessEqual(stats["max_batch"], 8)
+
+    def test_commit_waits_for_flush(self):
+        """
+        Test that commit only returns after a flush ran.
+        """
+        flushes = []
+        group = GroupCommit(lambda: flushes.append(1), 0.001, 4)
+        group.commit()
+        self.assertEqual(len(flushes), 1)
+
+    def test_error(self):
+        """
+        Test that a failed flush raises in the callers of its batch.
+        """
+        def flush():
+            raise IOError("disk full")
+        group = GroupCommit(flush, 0.001, 4)
+        with self.assertRaises(IOError):
+            group.commit()
+        self.assertEqual(group.stats()["flushes"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+"""
+Unit tests for the Journal class and FileStorage journal mode.
+"""
+
+import json
+import os
+import unittest
+from unittest import mock
+import models
+from models.engine.journal import Journal
+from models.engine.serializers import BinarySerializer
+from models.state import State
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+class TestJournal(unittest.TestCase):
+    """
+    Test cases for the Journal class.
+    """
+
+    path = "test_journal.json"
+
+    def tearDown(self):
+        """
+        Remove the snapshot and log files.
+        """
+        for suffix in ("", ".log", ".log.1", ".tmp"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_append_changes(self):
+        """
+        Test that changes keeps the last update or delete of each key.
+        """
+        journal = Journal(self.path, 1024 * 1024)
+        journal.append([("State.1", {"name": "a"}), ("State.2", {})])
+        journal.append([("State.1", {"name": "b"}), ("State.2", None)])
+        self.assertEqual(journal.changes(), {"State.1": {"name": "b"},
+                                             "State.2": None})
+
+    def test_torn_record(self):
+        """
+        Test that a partially written last record is ignored.
+        """
+        journal = Journal(self.path, 1024 * 1024)
+        journal.append([("State.1", {"name": "a"})])
+        with open(journal.path, 'a') as f:
+            f.write('{"key": "State.2", "val')
+        self.assertEqual(journal.changes(), {"State.1": {"name": "a"}})
+
+    def test_compact(self):
+        """
+        Test that a log past max_size is folded into the snapshot.
+        """
+        with open(self.path, 'w') as f:
+            json.dump({"State.1": {"name": "a"}}, f)
+        folded = mock.Mock()
+        journal = Journal(self.path, 1, folded=folded)
+        journal.append([("State.2", {"name": "b"}), ("State.1", None)])
+        journal.wait()
+        folded.assert_called_once_with()
+        self.assertFalse(os.path.exists(journal.path))
+        self.assertFalse(os.path.exists(journal.rotated))
+        with open(self.path, 'r') as f:
+            self.assertEqual(json.load(f), {"State.2": {"name": "b"}})
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+class TestFileStorageJournal(unittest.TestCase):
+    """
+    Test cases for FileStorage in journal mode.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Create a FileStorage instance in journal mode.
+        """
+        os.environ['HBNB_FILE_JOURNAL'] = "1"
+        cls.storage = models.engine.file_storage.FileStorage()
+        del os.environ['HBNB_FILE_JOURNAL']
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Remove the JSON file and its log.
+        """
+        for path in ('file.json', 'file.json.log'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_save_appends_changes(self):
+        """
+        Test that save only logs the objects changed since the last save.
+        """
+        self.storage.save()
+        state = State(name="Utah")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.delete(state)
+        self.storage.save()
+        with open('file.json.log', 'r') as f:
+            records = [json.loads(line) for line in f][-2:]
+        key = "State." + state.id
+        self.assertEqual(records[0]["key"], key)
+        self.assertEqual(records[0]["value"]["name"], "Utah")
+        self.assertEqual(records[1], {"key": key, "value": None})
+
+    def test_binary_fold(self):
+        """
+        Test that the first fold of the binary format keeps the entries of
+        the JSON file it replaces.
+        """
+        states = {}
+        for i in range(50):
+            state = State(name="State {}".format(i))
+            states["State." + state.id] = state.to_dict()
+        with open('file.json', 'w') as f:
+            json.dump(states, f)
+        environ = {'HBNB_FILE_JOURNAL': "1", 'HBNB_FILE_JOURNAL_SIZE': "1",
+                   'HBNB_FILE_FORMAT': "binary"}
+        with mock.patch.dict(os.environ, environ):
+            storage = models.engine.file_storage.FileStorage()
+        try:
+            storage.reload()
+            state = State(name="Utah")
+            storage.new(state)
+            storage.save()
+            storage._FileStorage__journal.wait()
+            with open('file.bin', 'rb') as f:
+                keys = {key for key, value in BinarySerializer().read(f)}
+            self.assertEqual(keys, set(states) | {"State." + state.id})
+            for key in keys:
+                storage.delete(storage.all()[key])
+        finally:
+            for path in ('file.bin', 'file.bin.log', 'file.bin.log.1'):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def test_fold_keeps_loaded(self):
+        """
+        Test that the files folded by a save are not read again.
+        """
+        os.environ['HBNB_FILE_JOURNAL'] = "1"
+        os.environ['HBNB_FILE_JOURNAL_SIZE'] = "1"
+        storage = models.engine.file_storage.FileStorage()
+        del os.environ['HBNB_FILE_JOURNAL']
+        del os.environ['HBNB_FILE_JOURNAL_SIZE']
+        storage.reload()
+        state = State(name="Utah")
+        storage.new(state)
+        storage.save()
+        storage._FileStorage__journal.wait()
+        self.assertFalse(os.path.exists('file.json.log.1'))
+        with mock.patch.object(storage, "_FileStorage__reload_snapshot") \
+                as reload_snapshot:
+            storage.close()
+        reload_snapshot.assert_not_called()
+        storage.delete(state)
+        storage.save()
+        storage._FileStorage__journal.wait()
+
+
+if __name__ == '__main__':
+    unittest.main()
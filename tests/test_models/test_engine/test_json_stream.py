@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""
+Unit tests for the ObjectStream class.
+"""
+
+import io
+import json
+import unittest
+from models.engine.json_stream import ObjectStream
+
+
+class TestObjectStream(unittest.TestCase):
+    """
+    Test cases for the ObjectStream class.
+    """
+
+    data = {"State.1": {"name": "Café ☃", "id": "1"},
+            "Place.2": {"price_by_night": 12345, "latitude": -1.5e-3,
+                        "amenity_ids": ["a", "b"], "description": None},
+            "n": 1234567890, "t": True}
+
+    def members(self, text, chunk_size):
+        """
+        Returns the members streamed from text in chunks of chunk_size.
+        """
+        f = io.BytesIO(text.encode('utf-8'))
+        return list(ObjectStream(f, chunk_size))
+
+    def test_members(self):
+        """
+        Test that every chunk size yields the members of json.load.
+        """
+        for text in (json.dumps(self.data),
+                     json.dumps(self.data, ensure_ascii=False, indent=2)):
+            for chunk_size in (1, 2, 3, 7, 64, 1 << 20):
+                with self.subTest(chunk_size=chunk_size):
+                    self.assertEqual(self.members(text, chunk_size),
+                                     list(self.data.items()))
+
+    def test_empty(self):
+        """
+        Test an empty object.
+        """
+        self.assertEqual(self.members(" { } ", 1), [])
+
+    def test_span(self):
+        """
+        Test that span holds the offsets of the last value.
+        """
+        text = '{"a": {"x": 1}, "b": [2]}'
+        stream = ObjectStream(io.BytesIO(text.encode('utf-8')), 4)
+        spans = [stream.span for member in stream]
+        self.assertEqual([text[s:e] for s, e in spans], ['{"x": 1}', '[2]'])
+
+    def test_malformed(self):
+        """
+        Test that truncated or invalid input raises ValueError.
+        """
+        for text in ('', '[1]', '{"a": 1', '{"a" 1}', '{"a": 1 "b": 2}'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    self.members(text, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
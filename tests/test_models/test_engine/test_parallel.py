@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Unit tests for the parallel loading of JSON snapshots.
+"""
+
+import json
+import os
+import unittest
+from unittest import mock
+from models.engine import file_storage, parallel
+from models.engine.file_storage import FileStorage, classes
+from models.city import City
+from models.state import State
+
+
+class TestParallel(unittest.TestCase):
+    """
+    Test cases for the parallel module.
+    """
+
+    path = "parallel.json"
+
+    def setUp(self):
+        """
+        Write a snapshot of states and cities.
+        """
+        self.states = [State(name="State {}".format(i)) for i in range(20)]
+        self.cities = [City(name="Town, \"}, \"City.x\": {", state_id=s.id)
+                       for s in self.states]
+        self.objs = self.states + self.cities
+        self.data = {type(obj).__name__ + "." + obj.id: obj.to_dict()
+                     for obj in self.objs}
+        with open(self.path, 'w') as file:
+            json.dump(self.data, file)
+
+    def tearDown(self):
+        """
+        Remove the snapshots.
+        """
+        for path in (self.path, 'file.json'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_load(self):
+        """
+        Test that every worker count builds the objects in file order.
+        """
+        for workers in (1, 2, 3, 8):
+            with self.subTest(workers=workers):
+                objs = parallel.load(self.path, workers, classes)
+                self.assertEqual([obj.to_dict() for obj in objs],
+                                 list(self.data.values()))
+
+    def test_skip(self):
+        """
+        Test that skipped keys are not built.
+        """
+        skip = {"State." + self.states[0].id}
+        objs = parallel.load(self.path, 2, classes, skip)
+        self.assertEqual(len(objs), len(self.objs) - 1)
+        self.assertNotIn(self.states[0].id, [obj.id for obj in objs])
+
+    def test_not_ascii(self):
+        """
+        Test that a file whose offsets are not bytes is not split.
+        """
+        self.data["State." + self.states[0].id]["name"] = "Café"
+        with open(self.path, 'w') as file:
+            json.dump(self.data, file, ensure_ascii=False)
+        self.assertIsNone(parallel.load(self.path, 2, classes))
+
+    def test_reload(self):
+        """
+        Test that FileStorage loads on the pool when HBNB_FILE_WORKERS is
+        set, but sequentially on a single CPU.
+        """
+        os.environ['HBNB_FILE_WORKERS'] = "2"
+        storage = FileStorage()
+        del os.environ['HBNB_FILE_WORKERS']
+        state = State(name="Iowa")
+        storage.new(state)
+        storage.save()
+        for cpus, calls in ((4, 1), (1, 0)):
+            with self.subTest(cpus=cpus):
+                os.utime('file.json', ns=(cpus, cpus))
+                with mock.patch.object(file_storage, "PARALLEL_MIN_SIZE",
+                                       0), \
+                        mock.patch.object(os, "cpu_count",
+                                          return_value=cpus), \
+                        mock.patch.object(parallel, "load",
+                                          wraps=parallel.load) as load:
+                    storage.reload()
+                self.assertEqual(load.call_count, calls)
+                reloaded = storage.get(State, state.id)
+                self.assertIsNot(reloaded, state)
+                self.assertEqual(reloaded.to_dict(), state.to_dict())
+                state = reloaded
+        storage.delete(state)
+        storage.save()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Unit tests for the TimedQueuePool class and the DBStorage pool options.
+"""
+
+import os
+import unittest
+from unittest import mock
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError
+from models.engine.db_storage import DBStorage
+from models.engine.pool import TimedQueuePool
+
+
+class TestTimedQueuePool(unittest.TestCase):
+    """
+    Test cases for the TimedQueuePool class.
+    """
+
+    def setUp(self):
+        """
+        Create an engine with a pool of one connection and no overflow.
+        """
+        self.engine = create_engine("sqlite://", poolclass=TimedQueuePool,
+                                    pool_size=1, max_overflow=0,
+                                    pool_timeout=0.05)
+
+    def tearDown(self):
+        """
+        Dispose of the engine.
+        """
+        self.engine.dispose()
+
+    def test_stats(self):
+        """
+        Test the occupancy and checkout counters.
+        """
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            stats = self.engine.pool.stats()
+            self.assertEqual(stats["checked_out"], 1)
+            self.assertEqual(stats["size"], 1)
+            self.assertEqual(stats["max_overflow"], 0)
+        stats = self.engine.pool.stats()
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["checked_in"], 1)
+        self.assertEqual(stats["checkouts"], 1)
+        self.assertEqual(stats["timeouts"], 0)
+        self.assertGreaterEqual(stats["max_wait"], stats["mean_wait"])
+
+    def test_timeout(self):
+        """
+        Test that a checkout timing out is counted with its wait.
+        """
+        with self.engine.connect():
+            with self.assertRaises(TimeoutError):
+                self.engine.connect()
+        stats = self.engine.pool.stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["checkouts"], 2)
+        self.assertGreaterEqual(stats["max_wait"], 0.05)
+
+
+class TestPoolOptions(unittest.TestCase):
+    """
+    Test cases for the DBStorage pool options.
+    """
+
+    def test_defaults(self):
+        """
+        Test the options when no variable is set.
+        """
+        with mock.patch.dict(os.environ):
+            for name in list(os.environ):
+                if name.startswith("HBNB_MYSQL_POOL") or \
+                        name == "HBNB_MYSQL_MAX_OVERFLOW":
+                    del os.environ[name]
+            options = DBStorage.pool_options()
+        self.assertIs(options["poolclass"], TimedQueuePool)
+        self.assertEqual(options["pool_size"], 5)
+        self.assertEqual(options["max_overflow"], 10)
+        self.assertFalse(options["pool_pre_ping"])
+
+    def test_environment(self):
+        """
+        Test the options set by the environment.
+        """
+        with mock.patch.dict(os.environ, {
+                "HBNB_MYSQL_POOL_SIZE": "20",
+                "HBNB_MYSQL_MAX_OVERFLOW": "5",
+                "HBNB_MYSQL_POOL_TIMEOUT": "2.5",
+                "HBNB_MYSQL_POOL_RECYCLE": "3600",
+                "HBNB_MYSQL_POOL_PRE_PING": "1"}):
+            options = DBStorage.pool_options()
+        self.assertEqual(options["pool_size"], 20)
+        self.assertEqual(options["max_overflow"], 5)
+        self.assertEqual(options["pool_timeout"], 2.5)
+        self.assertEqual(options["pool_recycle"], 3600)
+        self.assertTrue(options["pool_pre_ping"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+Unit tests for the Replicas and RoutingSession classes.
+"""
+
+import unittest
+from sqlalchemy import create_engine, insert, literal, select
+from sqlalchemy import Column, MetaData, String, Table
+from sqlalchemy.exc import OperationalError
+from models.engine.replicas import Replicas, RoutingSession
+
+
+class TestReplicas(unittest.TestCase):
+    """
+    Test cases for the read replica routing.
+    """
+
+    def setUp(self):
+        """
+        Create a primary, two replicas and one replica that is down.
+        """
+        self.primary = create_engine("sqlite://")
+        self.replicas = [create_engine("sqlite://"),
+                         create_engine("sqlite://")]
+        self.down = create_engine("sqlite:////nonexistent/dir/x.db")
+        self.table = Table("t", MetaData(), Column("id", String(60),
+                                                   primary_key=True))
+
+    def tearDown(self):
+        """
+        Dispose of the engines.
+        """
+        for engine in [self.primary, self.down] + self.replicas:
+            engine.dispose()
+
+    def test_round_robin(self):
+        """
+        Test that the replicas are picked in turn.
+        """
+        replicas = Replicas(self.replicas)
+        self.assertEqual([replicas.choose() for i in range(4)],
+                         self.replicas * 2)
+
+    def test_failed(self):
+        """
+        Test that a replica whose connection failed is skipped.
+        """
+        replicas = Replicas([self.down] + self.replicas, retry=60)
+        self.assertIs(replicas.choose(), self.down)
+        with self.assertRaises(OperationalError):
+            self.down.connect()
+        self.assertEqual([replicas.choose() for i in range(4)],
+                         self.replicas * 2)
+        self.assertEqual([r["healthy"] for r in replicas.stats()],
+                         [False, True, True])
+
+    def test_retry(self):
+        """
+        Test that a failed replica is checked again after retry seconds.
+        """
+        replicas = Replicas([self.down, self.replicas[0]], retry=0)
+        with self.assertRaises(OperationalError):
+            self.down.connect()
+        self.assertIs(replicas.choose(), self.replicas[0])
+        self.assertIs(replicas.choose(), self.replicas[0])
+        self.assertFalse(replicas.stats()[0]["healthy"])
+
+    def test_session(self):
+        """
+        Test that a session reads from one replica until it writes.
+        """
+        session = RoutingSession(Replicas(self.replicas), bind=self.primary)
+        query = select(literal(1))
+        replica = session.get_bind(clause=query)
+        self.assertIn(replica, self.replicas)
+        self.assertIs(session.get_bind(clause=query), replica)
+        self.assertIs(session.get_bind(clause=insert(self.table)),
+                      self.primary)
+        self.assertIs(session.get_bind(clause=query), self.primary)
+        session.close()
+        self.assertIn(session.get_bind(clause=query), self.replicas)
+        session.use_primary()
+        self.assertIs(session.get_bind(clause=query), self.primary)
+
+    def test_no_replicas(self):
+        """
+        Test that a session without replicas uses its bind.
+        """
+        session = RoutingSession(bind=self.primary)
+        self.assertIs(session.get_bind(clause=select(literal(1))),
+                      self.primary)
+
+
+if __name__ == '__main__':
+    unittest.main()
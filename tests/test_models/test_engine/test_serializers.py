@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""
+Unit tests for the snapshot serializers.
+"""
+
+from datetime import datetime, timedelta
+import io
+import json
+import unittest
+from models.engine.serializers import BinarySerializer, BinaryStream
+from models.engine.serializers import JSONSerializer
+
+
+class TestSerializers(unittest.TestCase):
+    """
+    Test cases for the JSON and binary serializers.
+    """
+
+    items = [("State.1", {"id": "1", "name": "Café ☃",
+                          "created_at": "2017-09-28T21:03:54.052298",
+                          "updated_at": "2017-09-28T21:03:54.000000",
+                          "__class__": "State"}),
+             ("City.2", {"id": "2", "state_id": "1", "name": "x" * 100,
+                         "__class__": "City"}),
+             ("City.3", {"id": "3", "state_id": "1", "name": "y",
+                         "__class__": "City"}),
+             ("other", {"id": "4", "price_by_night": -12345,
+                        "latitude": -1.5e-3, "amenity_ids": ["a", "b"],
+                        "extra": {"k": [None, True, False, 2 ** 70]},
+                        "checkin": "2017-09-28T21:03:54.052298",
+                        "__class__": "Place"})]
+
+    def binary(self):
+        """
+        Returns the binary snapshot of items.
+        """
+        return b"".join(BinarySerializer().dump(self.items))
+
+    def test_json(self):
+        """
+        Test that the JSON snapshot is the json.dumps of the entries.
+        """
+        text = "".join(JSONSerializer().dump(self.items))
+        self.assertEqual(json.loads(text), dict(self.items))
+        f = io.BytesIO(text.encode('utf-8'))
+        self.assertEqual(list(JSONSerializer().read(f)), self.items)
+
+    def test_binary(self):
+        """
+        Test that every chunk size reads back the entries, with datetime
+        timestamps.
+        """
+        data = self.binary()
+        expected = json.loads(json.dumps(self.items))
+        expected[0][1]["created_at"] = datetime(2017, 9, 28, 21, 3, 54,
+                                                52298)
+        expected[0][1]["updated_at"] = datetime(2017, 9, 28, 21, 3, 54)
+        for chunk_size in (1, 2, 3, 7, 64, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                entries = list(BinaryStream(io.BytesIO(data), chunk_size))
+                self.assertEqual([list(entry) for entry in entries],
+                                 expected)
+
+    def test_binary_rewrite(self):
+        """
+        Test that entries read back with datetimes are written the same.
+        """
+        data = self.binary()
+        entries = list(BinarySerializer().read(io.BytesIO(data)))
+        self.assertEqual(b"".join(BinarySerializer().dump(entries)), data)
+
+    def test_binary_smaller(self):
+        """
+        Test that repeated names and ids are not written again.
+        """
+        items = [("City.{}".format(i),
+                  {"id": str(i), "state_id": "a-state-id", "name": "c",
+                   "__class__": "City"}) for i in range(100)]
+        data = b"".join(BinarySerializer().dump(items))
+        self.assertEqual(data.count(b"state_id"), 1)
+        self.assertEqual(data.count(b"a-state-id"), 1)
+        self.assertLess(len(data),
+                        len("".join(JSONSerializer().dump(items))) / 3)
+
+    def test_binary_references(self):
+        """
+        Test that strings interned past the inline references, and strings
+        around INTERN_MAX bytes, read back at any chunk boundary.
+        """
+        items = [("City.{}".format(i),
+                  {"id": str(i), "state_id": str(i // 2),
+                   "name": "n" * (i % 3 + 63), "__class__": "City"})
+                 for i in range(20000)]
+        data = b"".join(BinarySerializer().dump(items))
+        for chunk_size in (7, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(list(BinaryStream(io.BytesIO(data),
+                                                   chunk_size)), items)
+
+    def test_binary_version_1(self):
+        """
+        Test that timestamps written as varints by the first version still
+        read back.
+        """
+        micros = (datetime(2017, 9, 28, 21, 3, 54, 52298) -
+                  datetime(1970, 1, 1)) // timedelta(microseconds=1)
+        n = micros << 1
+        varint = bytearray()
+        while n >= 0x80:
+            varint.append(n & 0x7f | 0x80)
+            n >>= 7
+        varint.append(n)
+        data = b"HBNB\x01\x01\x00\x05State\x02\x00\x02id" + \
+            b"\x00\x0acreated_at\x02\x00\x05\x00\x011\x06" + \
+            bytes(varint) + b"\x00"
+        self.assertEqual(list(BinaryStream(io.BytesIO(data))),
+                         [("State.1", {"id": "1",
+                                       "created_at": datetime(2017, 9, 28,
+                                                              21, 3, 54,
+                                                              52298),
+                                       "__class__": "State"})])
+
+    def test_binary_malformed(self):
+        """
+        Test that truncated or foreign input raises ValueError.
+        """
+        data = self.binary()
+        for bad in (b"", b"{}", data[:-1], data[:len(data) // 2]):
+            with self.subTest(size=len(bad)):
+                with self.assertRaises(ValueError):
+                    list(BinaryStream(io.BytesIO(bad), 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
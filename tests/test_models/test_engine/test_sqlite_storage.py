@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""
+Unit tests for the SQLiteStorage class.
+"""
+
+import models
+import os
+import tempfile
+import unittest
+from unittest import mock
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from models.engine.sqlite_storage import SQLiteStorage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing DB Storage")
+class TestSQLiteStorage(unittest.TestCase):
+    """
+    Test cases for the SQLiteStorage class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Create a storage on a temporary database file.
+        """
+        cls.directory = tempfile.TemporaryDirectory()
+        os.environ['HBNB_SQLITE_PATH'] = os.path.join(cls.directory.name,
+                                                      'hbnb.db')
+        cls.storage = SQLiteStorage()
+        del os.environ['HBNB_SQLITE_PATH']
+        cls.storage.reload()
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Remove the database file.
+        """
+        cls.storage.close()
+        cls.directory.cleanup()
+
+    def tearDown(self):
+        """
+        Discard the changes not saved.
+        """
+        self.storage.close()
+
+    def test_pragmas(self):
+        """
+        Test that connections use WAL and enforce foreign keys.
+        """
+        with self.storage.engine().connect() as connection:
+            self.assertEqual(connection.execute(
+                text("PRAGMA journal_mode")).scalar(), "wal")
+            self.assertEqual(connection.execute(
+                text("PRAGMA foreign_keys")).scalar(), 1)
+
+    def test_save_get_count(self):
+        """
+        Test that saved objects are found in a new session.
+        """
+        state = State(name="Utah")
+        self.storage.new(state)
+        self.storage.save()
+        city = City(name="Provo", state_id=state.id)
+        self.storage.new(city)
+        self.storage.save()
+        self.storage.close()
+        found = self.storage.get(State, state.id)
+        self.assertEqual(found.name, "Utah")
+        self.assertEqual([c.id for c in found.cities], [city.id])
+        self.assertEqual(self.storage.count(City),
+                         self.storage.count_all()["City"])
+
+    def test_foreign_key(self):
+        """
+        Test that a city of a missing state is refused.
+        """
+        self.storage.new(City(name="Nowhere", state_id="missing"))
+        with self.assertRaises(IntegrityError):
+            self.storage.save()
+
+    def test_bulk_upsert_partial(self):
+        """
+        Test that the columns a record leaves out get their default.
+        """
+        state = State(name="Utah")
+        city = City(name="Provo", state_id=state.id)
+        user = User(email="a@b.c", password="pwd")
+        self.storage.bulk_new([state, city, user])
+        record = {"name": "Loft", "city_id": city.id, "user_id": user.id}
+        self.assertEqual(self.storage.bulk_upsert(Place, [record]), 1)
+        place, = self.storage.all(Place).values()
+        self.assertEqual(place.name, "Loft")
+        self.assertEqual(place.number_rooms, 0)
+        self.assertIsNone(place.description)
+
+    def test_group_commit(self):
+        """
+        Test that objects saved by a group commit stay usable, their
+        relationships included.
+        """
+        with mock.patch.dict(os.environ, {
+                'HBNB_SQLITE_PATH': os.path.join(self.directory.name,
+                                                 'group.db'),
+                'HBNB_COMMIT_WINDOW_MS': '1'}):
+            storage = SQLiteStorage()
+        storage.reload()
+        try:
+            state = State(name="Utah")
+            storage.new(state)
+            storage.save()
+            city = City(name="Provo", state_id=state.id)
+            storage.new(city)
+            storage.save()
+            self.assertEqual([c.id for c in state.cities], [city.id])
+            self.assertIs(city.state, state)
+            state.name = "UT"
+            storage.save()
+            self.assertIs(storage.get(State, state.id), state)
+            storage.close()
+            self.assertEqual(storage.get(State, state.id).name, "UT")
+        finally:
+            storage.close()
+
+    def test_indexes(self):
+        """
+        Test that the tables have the indexes declared by the models.
+        """
+        self.assertEqual(self.storage.missing_indexes(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+"""
+Unit tests for the Serializer class.
+"""
+
+import json
+import models
+import unittest
+from unittest import mock
+from models import base_model, serializer
+from models.place import Place
+from models.review import Review
+from models.serializer import Serializer, get_serializer
+from models.user import User
+
+
+class TestSerializer(unittest.TestCase):
+    """
+    Test cases for the per-class serializers of to_dict().
+    """
+
+    def setUp(self):
+        """
+        Build objects of several layouts and value types.
+        """
+        place = Place(name="Loft", city_id="c", user_id="u", number_rooms=3,
+                      latitude=37.77, longitude=float("nan"),
+                      description=None, amenity_ids=["a", "b"])
+        place.available = True
+        self.objs = [Review(text="Gréat \"stay\"\n", place_id="p",
+                            user_id="u"),
+                     place, Place(**place.to_dict()),
+                     User(email="a@b.c", password="pwd"), Review()]
+
+    @staticmethod
+    def expected(obj, fields=None):
+        """Returns the to_dict() of the reference implementation"""
+        d = obj.__dict__.copy()
+        for attr in ("created_at", "updated_at"):
+            if attr in d:
+                d[attr] = d[attr].strftime("%Y-%m-%dT%H:%M:%S.%f")
+        d["__class__"] = type(obj).__name__
+        d.pop("_sa_instance_state", None)
+        if fields is not None:
+            d = {name: value for name, value in d.items() if name in fields}
+        return d
+
+    def test_identical(self):
+        """
+        Test that the output is byte-identical to the reference.
+        """
+        for obj in self.objs:
+            with self.subTest(obj=type(obj).__name__):
+                expected = json.dumps(self.expected(obj))
+                self.assertEqual(json.dumps(obj.to_dict()), expected)
+                self.assertEqual(obj.to_json(), expected)
+                self.assertEqual(obj.to_json(), obj.to_json())
+
+    def test_fields(self):
+        """
+        Test that projections keep the to_dict() order of their keys.
+        """
+        for fields in [("id", "__class__"), ("updated_at", "name", "text",
+                                             "missing"), ()]:
+            for obj in self.objs:
+                with self.subTest(fields=fields, obj=type(obj).__name__):
+                    expected = self.expected(obj, fields)
+                    self.assertEqual(json.dumps(obj.to_dict(fields)),
+                                     json.dumps(expected))
+                    self.assertEqual(obj.to_json(fields),
+                                     json.dumps(expected))
+
+    def test_compact(self):
+        """
+        Test that the compact text is sorted and without spaces.
+        """
+        for obj in self.objs:
+            with self.subTest(obj=type(obj).__name__):
+                self.assertEqual(obj.to_json(compact=True),
+                                 json.dumps(self.expected(obj),
+                                            sort_keys=True,
+                                            separators=(",", ":")))
+
+    def test_generic(self):
+        """
+        Test the encoders of layouts past MAX_LAYOUTS.
+        """
+        with mock.patch.object(serializer, "MAX_LAYOUTS", 0):
+            place = Serializer(Place)
+            obj = self.objs[1]
+            self.assertEqual(place.to_json(obj),
+                             json.dumps(self.expected(obj)))
+            self.assertEqual(place.to_json(obj, compact=True),
+                             json.dumps(self.expected(obj),
+                                        **serializer.COMPACT))
+            self.assertEqual(place.to_dict(obj, ["id"]), {"id": obj.id})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_cache(self):
+        """
+        Test that the JSON text is kept until the object changes, outside
+        of its __dict__.
+        """
+        obj = self.objs[0]
+        with mock.patch.object(base_model, "cache_json", True):
+            text = obj.to_json()
+            self.assertIs(obj.to_json(), text)
+            self.assertIsNot(obj.to_json(compact=True), text)
+            self.assertEqual(json.loads(text), obj.to_dict())
+            obj.text = "Changed"
+            self.assertEqual(json.loads(obj.to_json())["text"], "Changed")
+            compact = obj.to_json(compact=True)
+            del obj.text
+            self.assertNotIn('"text"', obj.to_json(compact=True))
+            self.assertNotEqual(obj.to_json(compact=True), compact)
+            text = obj.to_json()
+            with mock.patch.object(models, "storage"):
+                obj.save()
+            self.assertNotEqual(obj.to_json(), text)
+            self.assertNotIn("_BaseModel__json", obj.__dict__)
+
+    def test_get_serializer(self):
+        """
+        Test that a class has a single serializer.
+        """
+        self.assertIs(get_serializer(Place), get_serializer(Place))
+        self.assertEqual(get_serializer(Place).name, "Place")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""
+Unit tests for the timestamp codec of to_dict().
+"""
+
+from datetime import datetime, timedelta, timezone
+import unittest
+from models import timestamps
+from models.timestamps import TIME_FORMAT
+
+
+class TestTimestamps(unittest.TestCase):
+    """
+    Test cases for the timestamps module.
+    """
+
+    def setUp(self):
+        """
+        Build distinct datetimes and their strptime() strings.
+        """
+        start = datetime(2024, 1, 1)
+        self.values = [start + timedelta(seconds=i, microseconds=i * 7)
+                       for i in range(100)]
+        self.strings = [value.strftime(TIME_FORMAT) for value in self.values]
+
+    def test_round_trip(self):
+        """
+        Test that the codec matches strptime() and strftime().
+        """
+        values = self.values + [datetime(2024, 1, 2),
+                                datetime(999, 1, 1, 0, 0, 0, 5),
+                                datetime(2024, 1, 1, tzinfo=timezone.utc)]
+        for value in values:
+            self.assertEqual(timestamps.encode(value),
+                             value.strftime(TIME_FORMAT))
+        noon = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+        for value in [noon, noon.astimezone(timezone(timedelta(hours=1)))]:
+            self.assertEqual(timestamps.encode(value),
+                             value.strftime(TIME_FORMAT))
+        for s in self.strings + ["2024-1-2T3:4:5.6"]:
+            self.assertEqual(timestamps.decode(s),
+                             datetime.strptime(s, TIME_FORMAT))
+
+    def test_invalid(self):
+        """
+        Test that strings strptime() refuses raise ValueError.
+        """
+        for s in ["2024-01-02T03:04:05.00000Z", "2024-13-02T03:04:05.000000",
+                  "2024-01-02 03:04:05.000000", "2024-01-02T03:04:05",
+                  "2024-W01-1T03:04:05.123456", ""]:
+            with self.subTest(s=s):
+                with self.assertRaises(ValueError):
+                    timestamps.decode(s)
+
+    @unittest.skipUnless(timestamps.CACHE_SIZE, "the cache is disabled")
+    def test_cache(self):
+        """
+        Test that repeated naive datetimes are encoded once, and that aware
+        ones bypass the cache.
+        """
+        timestamps.isoformat.cache_clear()
+        for value in self.values[:10] * 3:
+            timestamps.encode(value)
+        info = timestamps.isoformat.cache_info()
+        self.assertEqual((info.hits, info.misses), (20, 10))
+        noon = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+        for value in [noon, noon.astimezone(timezone(timedelta(hours=1))),
+                      noon, datetime(999, 1, 1)]:
+            timestamps.encode(value)
+        self.assertEqual(timestamps.isoformat.cache_info(), info)
+
+
+if __name__ == '__main__':
+    unittest.main()